@@ -0,0 +1,243 @@
+"""Amostragem de incerteza distribuída, reprodutível e com checkpoints
+
+Uso em servidores de lote:
+
+    python amostragem.py --diretorio execucao_01 --amostras 1000000 --residuo-anual-kg 270
+
+Cada bloco de amostras recebe seu próprio fluxo aleatório gerado por
+`SeedSequence(semente).spawn(n_blocos)`. Como a semente depende apenas do
+índice do bloco (e não do processo que o executa), o resultado é idêntico
+bit a bit para qualquer número de processos, e uma execução interrompida
+pode ser retomada sem repetir nem pular amostras.
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from modelo_emissoes import VERSAO_MODELO, PARAMETROS_PADRAO, calcular_emissoes_evitadas_parametros
+
+# =============================================================================
+# DISTRIBUIÇÕES DOS PARÂMETROS INCERTOS
+# =============================================================================
+
+# nome -> (tipo, parâmetros da distribuição)
+DISTRIBUICOES_INCERTEZA = {
+    'umidade': ('triangular', (0.80, 0.85, 0.90)),
+    'TOC': ('triangular', (0.40, 0.436, 0.47)),
+    'TN': ('triangular', (12.0 / 1000, 14.2 / 1000, 16.5 / 1000)),
+    'CH4_frac': ('uniforme', (0.08 / 100, 0.18 / 100)),
+    'N2O_frac': ('uniforme', (0.60 / 100, 1.20 / 100)),
+    'temperatura': ('uniforme', (20.0, 30.0)),
+    'DOC': ('triangular', (0.12, 0.15, 0.18)),
+    'MCF': ('uniforme', (0.8, 1.0)),
+    'OX': ('uniforme', (0.0, 0.1)),
+    'fator_N2O_aterro': ('uniforme', (0.003, 0.007)),
+}
+
+ROTULOS_PARAMETROS = {
+    'umidade': 'Umidade',
+    'TOC': 'TOC',
+    'TN': 'TN',
+    'CH4_frac': 'Fração CH₄-C/TOC',
+    'N2O_frac': 'Fração N₂O-N/TN',
+    'temperatura': 'Temperatura',
+    'DOC': 'DOC',
+    'MCF': 'MCF',
+    'OX': 'OX',
+    'fator_N2O_aterro': 'Fator N₂O aterro',
+}
+
+MANIFESTO = "manifesto.json"
+
+def _amostrar(rng, tipo, params, n):
+    """Sorteia `n` valores de uma distribuição"""
+    if tipo == 'uniforme':
+        return rng.uniform(params[0], params[1], n)
+    if tipo == 'triangular':
+        return rng.triangular(params[0], params[1], params[2], n)
+    if tipo == 'normal':
+        return rng.normal(params[0], params[1], n)
+    raise ValueError(f"Distribuição desconhecida: {tipo}")
+
+def _caminho_bloco(diretorio, indice):
+    return os.path.join(diretorio, f"bloco_{indice:06d}.npz")
+
+def _salvar_atomico(caminho, **arrays):
+    """Grava o arquivo em um temporário e renomeia, para nunca deixar blocos pela metade"""
+    temporario = caminho + ".tmp"
+    with open(temporario, 'wb') as arquivo:
+        np.savez(arquivo, **arrays)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+
+def _executar_bloco(diretorio, indice, semente_bloco, n, residuo_anual_kg, distribuicoes):
+    """Sorteia e avalia um bloco de amostras, gravando o checkpoint em disco"""
+    rng = np.random.Generator(np.random.PCG64(semente_bloco))
+    nomes = sorted(distribuicoes)
+    amostras = np.column_stack([
+        _amostrar(rng, *distribuicoes[nome], n) for nome in nomes
+    ])
+    evitadas = calcular_emissoes_evitadas_parametros(
+        residuo_anual_kg, {nome: amostras[:, i] for i, nome in enumerate(nomes)}
+    )
+    _salvar_atomico(_caminho_bloco(diretorio, indice), amostras=amostras, evitadas=evitadas)
+    return indice
+
+def _verificar_manifesto(diretorio, configuracao):
+    """Cria o manifesto da execução ou confirma que o existente é compatível"""
+    caminho = os.path.join(diretorio, MANIFESTO)
+    if os.path.exists(caminho):
+        with open(caminho, encoding='utf-8') as arquivo:
+            existente = json.load(arquivo)
+        if existente != configuracao:
+            raise ValueError(
+                f"O diretório {diretorio} contém uma execução com configuração diferente"
+            )
+        return
+    temporario = caminho + ".tmp"
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(configuracao, arquivo, indent=2, sort_keys=True)
+    os.replace(temporario, caminho)
+
+def _limites(tipo, params, base=None):
+    """Limites inferior e superior de uma distribuição (±2σ para a normal)
+
+    Se o valor `base` estiver fora dos limites (ex.: propriedades de uma
+    mistura de resíduos diferente da padrão), a amplitude relativa da
+    distribuição em torno do seu valor nominal é aplicada ao valor base.
+    """
+    if tipo == 'normal':
+        nominal, inferior, superior = params[0], params[0] - 2 * params[1], params[0] + 2 * params[1]
+    elif tipo == 'triangular':
+        nominal, inferior, superior = params[1], params[0], params[2]
+    else:
+        nominal, inferior, superior = (params[0] + params[1]) / 2, params[0], params[1]
+    if base is None or inferior <= base <= superior or nominal == 0:
+        return inferior, superior
+    return base * inferior / nominal, base * superior / nominal
+
+def calcular_sensibilidade(residuo_anual_kg, parametros_base=None, distribuicoes=None):
+    """Sensibilidade um-de-cada-vez das emissões evitadas aos limites de cada parâmetro
+
+    Os limites ficam sempre em lados opostos do valor base (ver `_limites`).
+    Retorna o valor base e uma lista de (nome, valor_no_limite_inferior,
+    valor_no_limite_superior), avaliados em uma única chamada vetorizada.
+    """
+    if distribuicoes is None:
+        distribuicoes = DISTRIBUICOES_INCERTEZA
+    base = dict(PARAMETROS_PADRAO)
+    if parametros_base is not None:
+        base.update({nome: valor for nome, valor in parametros_base.items() if nome in base})
+    nomes = sorted(distribuicoes)
+
+    # Linha 0: caso base; linhas 2i+1 e 2i+2: parâmetro i nos limites
+    n = 2 * len(nomes) + 1
+    parametros = {nome: np.full(n, valor, dtype=float) for nome, valor in base.items()}
+    for i, nome in enumerate(nomes):
+        parametros[nome][2 * i + 1], parametros[nome][2 * i + 2] = _limites(*distribuicoes[nome], base[nome])
+
+    evitadas = calcular_emissoes_evitadas_parametros(residuo_anual_kg, parametros)
+    return float(evitadas[0]), [
+        (nome, float(evitadas[2 * i + 1]), float(evitadas[2 * i + 2]))
+        for i, nome in enumerate(nomes)
+    ]
+
+# =============================================================================
+# EXECUÇÃO
+# =============================================================================
+
+def executar_amostragem(diretorio, n_amostras, residuo_anual_kg, semente=0,
+                        tamanho_bloco=10_000, n_processos=None, distribuicoes=None):
+    """Executa (ou retoma) a amostragem de incerteza das emissões evitadas
+
+    Retorna um dicionário com os nomes dos parâmetros, a matriz de amostras
+    (n_amostras × n_parâmetros) e as emissões evitadas (tCO₂eq/ano) de cada amostra.
+    """
+    if n_amostras < 1:
+        raise ValueError("O número de amostras deve ser positivo")
+    if tamanho_bloco < 1:
+        raise ValueError("O tamanho do bloco deve ser positivo")
+    if n_processos is not None and n_processos < 1:
+        raise ValueError("O número de processos deve ser positivo")
+    if distribuicoes is None:
+        distribuicoes = DISTRIBUICOES_INCERTEZA
+    if n_processos is None:
+        n_processos = os.cpu_count() or 1
+
+    os.makedirs(diretorio, exist_ok=True)
+    _verificar_manifesto(diretorio, {
+        'versao_modelo': VERSAO_MODELO,
+        'n_amostras': int(n_amostras),
+        'residuo_anual_kg': float(residuo_anual_kg),
+        'semente': int(semente),
+        'tamanho_bloco': int(tamanho_bloco),
+        'distribuicoes': {nome: [tipo, list(params)] for nome, (tipo, params) in distribuicoes.items()},
+    })
+
+    # Sementes dependem apenas do índice do bloco, nunca do processo
+    n_blocos = -(-n_amostras // tamanho_bloco)
+    sementes = np.random.SeedSequence(semente).spawn(n_blocos)
+    tamanhos = [min(tamanho_bloco, n_amostras - i * tamanho_bloco) for i in range(n_blocos)]
+
+    pendentes = [i for i in range(n_blocos) if not os.path.exists(_caminho_bloco(diretorio, i))]
+
+    if pendentes:
+        if n_processos == 1:
+            for i in pendentes:
+                _executar_bloco(diretorio, i, sementes[i], tamanhos[i], residuo_anual_kg, distribuicoes)
+        else:
+            with ProcessPoolExecutor(max_workers=n_processos) as executor:
+                futuros = [
+                    executor.submit(_executar_bloco, diretorio, i, sementes[i], tamanhos[i],
+                                    residuo_anual_kg, distribuicoes)
+                    for i in pendentes
+                ]
+                for futuro in as_completed(futuros):
+                    futuro.result()
+
+    # Concatenar sempre na ordem dos blocos
+    amostras, evitadas = [], []
+    for i in range(n_blocos):
+        with np.load(_caminho_bloco(diretorio, i)) as bloco:
+            amostras.append(bloco['amostras'])
+            evitadas.append(bloco['evitadas'])
+
+    return {
+        'parametros': sorted(distribuicoes),
+        'amostras': np.concatenate(amostras),
+        'evitadas': np.concatenate(evitadas),
+    }
+
+def _inteiro_positivo(texto):
+    valor = int(texto)
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"deve ser um inteiro positivo: {texto}")
+    return valor
+
+def main():
+    parser = argparse.ArgumentParser(description="Amostragem de incerteza das emissões evitadas")
+    parser.add_argument("--diretorio", required=True, help="Diretório de checkpoints da execução")
+    parser.add_argument("--amostras", type=_inteiro_positivo, required=True, help="Número total de amostras")
+    parser.add_argument("--residuo-anual-kg", type=float, required=True, help="Resíduo processado por ano (kg)")
+    parser.add_argument("--semente", type=int, default=0, help="Semente raiz da SeedSequence")
+    parser.add_argument("--bloco", type=_inteiro_positivo, default=10_000, help="Amostras por bloco de checkpoint")
+    parser.add_argument("--processos", type=_inteiro_positivo, default=None, help="Número de processos (padrão: todos os núcleos)")
+    args = parser.parse_args()
+
+    resultado = executar_amostragem(
+        args.diretorio, args.amostras, args.residuo_anual_kg,
+        semente=args.semente, tamanho_bloco=args.bloco, n_processos=args.processos
+    )
+    evitadas = resultado['evitadas']
+    p5, p50, p95 = np.percentile(evitadas, [5, 50, 95])
+    print(f"Amostras: {evitadas.size}")
+    print(f"Emissões evitadas (tCO₂eq/ano): média {evitadas.mean():.4f} | "
+          f"P5 {p5:.4f} | P50 {p50:.4f} | P95 {p95:.4f}")
+
+if __name__ == "__main__":
+    main()
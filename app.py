@@ -2,11 +2,48 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from contextlib import closing
 import requests
 from bs4 import BeautifulSoup
 import warnings
 warnings.filterwarnings("ignore")
 
+from modelo_emissoes import (
+    T,
+    DENSIDADE_RESIDUO,
+    calcular_docf,
+    docf_efetivo,
+    COMPONENTES_RESIDUO,
+    COMPOSICAO_PADRAO,
+    propriedades_mistura,
+    LINHAS_BASE,
+    calcular_emissoes_metodologias,
+    calcular_valor_creditos,
+    calcular_detalhes_emissoes,
+)
+from climatologia import (
+    NOMES_MESES,
+    carregar_climatologia,
+    projetar_aterro_mensal,
+    projetar_evitadas_mensais,
+)
+from armazenamento import (
+    conectar,
+    chave_simulacao,
+    buscar_simulacao,
+    salvar_simulacao,
+    consultar_historico,
+)
+from amostragem import ROTULOS_PARAMETROS, calcular_sensibilidade
+from graficos import (
+    grafico_projecao_anual,
+    grafico_aterro_vs_compostagem,
+    grafico_tornado,
+    grafico_comparacao_cenarios,
+)
+from projecao import HORIZONTE_MAXIMO_ANOS, projetar
+from cenarios import CAMPOS_CENARIO, nome_cenario, avaliar_cenarios_com_cache
+
 # Configuração da página
 st.set_page_config(
     page_title="Compostagem Escolar - Ribeirão Preto",
@@ -45,6 +82,12 @@ def inicializar_session_state():
         st.session_state.cotacao_carregada = False
     if 'run_simulation' not in st.session_state:
         st.session_state.run_simulation = False
+    if 'cenarios_fixados' not in st.session_state:
+        st.session_state.cenarios_fixados = []
+    if 'versao_cenarios' not in st.session_state:
+        st.session_state.versao_cenarios = 0
+    if 'resultados_cenarios' not in st.session_state:
+        st.session_state.resultados_cenarios = {}
 
 # =============================================================================
 # FUNÇÃO DE FORMATAÇÃO BRASILEIRA
@@ -186,10 +229,6 @@ def obter_cotacao_euro_real():
     # Fallback para valor de referência
     return 5.50, "R$", False, "Referência"
 
-def calcular_valor_creditos(emissoes_evitadas_tco2eq, preco_carbono_por_tonelada, taxa_cambio=1):
-    """Calcula o valor financeiro das emissões evitadas"""
-    return emissoes_evitadas_tco2eq * preco_carbono_por_tonelada * taxa_cambio
-
 def exibir_painel_cotacoes():
     """Exibe o painel de cotações atualizado na sidebar"""
     
@@ -266,26 +305,6 @@ def exibir_painel_cotacoes():
         - Em caso de falha, usa valores de referência
         """)
 
-# =============================================================================
-# PARÂMETROS TÉCNICOS FIXOS (ATUALIZADOS COM DOCf VARIÁVEL)
-# =============================================================================
-
-# Parâmetros para cálculos de emissões (baseados em literatura científica)
-T = 25  # Temperatura média
-
-# Cálculo do DOCf baseado na temperatura (equação do segundo script)
-DOCf_val = 0.0147 * T + 0.28
-
-# Compostagem com minhocas (Yang et al. 2017)
-TOC_COMPOSTAGEM_MINHOCAS = 0.436
-TN_COMPOSTAGEM_MINHOCAS = 14.2 / 1000
-CH4_C_FRAC_COMPOSTAGEM_MINHOCAS = 0.13 / 100
-N2O_N_FRAC_COMPOSTAGEM_MINHOCAS = 0.92 / 100
-
-# GWP (IPCC AR6)
-GWP_CH4_20 = 79.7
-GWP_N2O_20 = 273
-
 # =============================================================================
 # CONFIGURAÇÃO DO SISTEMA
 # =============================================================================
@@ -300,6 +319,11 @@ exibir_painel_cotacoes()
 with st.sidebar:
     st.header("⚙️ Configuração do Sistema")
     
+    escola = st.text_input(
+        "🏫 Nome da escola (opcional)",
+        help="Identifica a escola no histórico de simulações"
+    ).strip()
+    
     # Sistema de reatores
     st.subheader("📦 Reatores de Compostagem")
     
@@ -331,7 +355,7 @@ with st.sidebar:
     )
     
     # Cálculos automáticos
-    densidade_residuo = 0.5  # kg/L - fixo para resíduos escolares
+    densidade_residuo = DENSIDADE_RESIDUO  # kg/L - fixo para resíduos escolares
     capacidade_ciclo_kg = capacidade_reator * densidade_residuo * num_reatores
     residuo_anual_kg = capacidade_ciclo_kg * ciclos_ano
     residuo_anual_ton = residuo_anual_kg / 1000
@@ -344,17 +368,144 @@ with st.sidebar:
     - **Resíduos/dia:** {formatar_brasil(residuos_kg_dia, 1)} kg
     """)
     
+    # Composição dos resíduos
+    st.subheader("🥕 Composição dos Resíduos")
+    
+    percentuais = [
+        st.slider(
+            f"{componente} (%)",
+            min_value=0,
+            max_value=100,
+            value=int(round(fracao * 100)),
+            step=5,
+            key=f"composicao_{i}"
+        )
+        for i, (componente, fracao) in enumerate(zip(COMPONENTES_RESIDUO, COMPOSICAO_PADRAO))
+    ]
+    
+    if sum(percentuais) > 0:
+        composicao = [p / sum(percentuais) for p in percentuais]
+    else:
+        st.warning("Composição vazia - usando a composição padrão")
+        composicao = list(COMPOSICAO_PADRAO)
+    
+    mistura = propriedades_mistura(composicao)
+    st.caption(
+        f"Mistura normalizada • Umidade {formatar_brasil(mistura['umidade'] * 100, 1)}% • "
+        f"DOC {formatar_brasil(mistura['DOC'], 3)}"
+    )
+    
+    # Temperatura (DOCf do aterro)
+    st.subheader("🌡️ Temperatura")
+    
+    modo_temperatura = st.radio(
+        "Temperatura para o DOCf do aterro",
+        options=["Climatologia de Ribeirão Preto", "Arquivo CSV", f"Fixa ({T} °C)"],
+        index=2,
+        help="A temperatura de cada mês define o DOCf = 0.0147 × T + 0.28"
+    )
+    
+    temperaturas_mensais = None
+    if modo_temperatura == "Climatologia de Ribeirão Preto":
+        temperaturas_mensais = carregar_climatologia()
+    elif modo_temperatura == "Arquivo CSV":
+        arquivo_temperatura = st.file_uploader(
+            "CSV com colunas mes,temperatura ou data,temperatura",
+            type=["csv"],
+            help="Séries com datas (AAAA-MM-DD ou DD/MM/AAAA) de vários anos são reduzidas "
+                 "à média de cada mês do ano; a mesma climatologia se repete em todos os anos"
+        )
+        if arquivo_temperatura is not None:
+            try:
+                temperaturas_mensais = carregar_climatologia(arquivo_temperatura)
+            except ValueError as e:
+                st.error(f"Arquivo inválido: {e}")
+        if temperaturas_mensais is None:
+            st.warning("Usando a climatologia de Ribeirão Preto")
+            temperaturas_mensais = carregar_climatologia()
+    
+    if temperaturas_mensais is not None:
+        st.caption(
+            f"Climatologia mensal (média de cada mês) • "
+            f"Temperatura média {formatar_brasil(temperaturas_mensais.mean(), 1)} °C • "
+            f"DOCf médio {formatar_brasil(docf_efetivo(temperaturas_mensais), 3)}"
+        )
+    
     # Período de simulação
     st.subheader("📅 Período de Projeto")
-    anos_simulacao = st.selectbox(
-        "Duração do projeto",
-        options=[4, 8, 12, 16, 20],
-        index=0,  # Padrão 4 anos
-        help="Período típico para projetos escolares"
+    anos_simulacao = st.slider(
+        "Duração do projeto (anos)",
+        min_value=1,
+        max_value=HORIZONTE_MAXIMO_ANOS,
+        value=4,  # Padrão 4 anos
+        step=1,
+        help="Projetos escolares costumam ter de 4 a 20 anos"
     )
     
+    with st.expander("📈 Opções de Projeção"):
+        granularidade = st.radio(
+            "Granularidade",
+            options=["anual", "mensal"],
+            format_func=str.capitalize,
+            horizontal=True
+        )
+        rampa_meses = st.slider(
+            "Meses até a operação plena",
+            min_value=0,
+            max_value=24,
+            value=0,
+            help="Rampa linear de processamento no início do projeto"
+        )
+        reatores_adicionais = st.slider(
+            "Reatores adicionais (expansão)",
+            min_value=0,
+            max_value=10,
+            value=0
+        )
+        ano_expansao = st.number_input(
+            "Ano da expansão",
+            min_value=1,
+            max_value=anos_simulacao,
+            value=min(2, anos_simulacao),
+            disabled=reatores_adicionais == 0
+        )
+        periodo_emissao_meses = st.selectbox(
+            "Período de verificação/emissão de créditos (meses)",
+            options=[6, 12, 24, 60],
+            index=1
+        )
+    
+    # Expansão: capacidade adicional proporcional ao número de reatores
+    expansoes = []
+    if reatores_adicionais > 0:
+        expansoes = [(12 * (int(ano_expansao) - 1) + 1, reatores_adicionais / num_reatores)]
+    opcoes_projecao = {
+        'granularidade': granularidade,
+        'rampa_meses': rampa_meses,
+        'expansoes': expansoes,
+        'periodo_emissao_meses': periodo_emissao_meses
+    }
+    
     if st.button("🚀 Calcular Créditos de Carbono", type="primary", use_container_width=True):
         st.session_state.run_simulation = True
+    
+    if st.button("📌 Fixar para Comparação", use_container_width=True,
+                 help="Adiciona a configuração atual à comparação de cenários"):
+        cenario = {
+            'capacidade_reator': capacidade_reator,
+            'num_reatores': num_reatores,
+            'ciclos_ano': ciclos_ano,
+            'anos_simulacao': anos_simulacao,
+            'rampa_meses': rampa_meses,
+            'reatores_adicionais': reatores_adicionais,
+            'ano_expansao': int(ano_expansao),
+            'preco_carbono': st.session_state.preco_carbono,
+            'taxa_cambio': st.session_state.taxa_cambio
+        }
+        # Partir da tabela editada para não perder alterações já feitas
+        fixados = st.session_state.get('cenarios_editados', st.session_state.cenarios_fixados)
+        st.session_state.cenarios_fixados = fixados + [cenario]
+        st.session_state.versao_cenarios += 1
 
 # =============================================================================
 # INFORMAÇÕES DO SISTEMA
@@ -402,127 +553,24 @@ with col3:
     """)
 
 # =============================================================================
-# CÁLCULOS BASEADOS EM IPCC (ATUALIZADOS)
+# PROJEÇÃO DAS METODOLOGIAS (DOCf SAZONAL)
 # =============================================================================
 
-def calcular_emissoes_compostagem_minhocas(residuos_kg_dia_param):
-    """Calcula emissões da compostagem com minhocas baseado em Yang et al. 2017"""
-    # Parâmetros fixos para resíduos escolares
-    umidade = 0.85  # 85% - típico para frutas/verduras
-    fracao_ms = 1 - umidade
-    
-    # Cálculo baseado em Yang et al. (2017)
-    ch4_total_por_lote = residuos_kg_dia_param * (TOC_COMPOSTAGEM_MINHOCAS * CH4_C_FRAC_COMPOSTAGEM_MINHOCAS * (16/12) * fracao_ms)
-    n2o_total_por_lote = residuos_kg_dia_param * (TN_COMPOSTAGEM_MINHOCAS * N2O_N_FRAC_COMPOSTAGEM_MINHOCAS * (44/28) * fracao_ms)
-    
-    # Emissões anuais (simplificado)
-    emissões_CH4_ano = ch4_total_por_lote * 365
-    emissões_N2O_ano = n2o_total_por_lote * 365
-    
-    # Converter para tCO₂eq
-    emissões_tco2eq_ano = (emissões_CH4_ano * GWP_CH4_20 + emissões_N2O_ano * GWP_N2O_20) / 1000
-    
-    return emissões_tco2eq_ano
-
-def calcular_emissoes_aterro(residuo_anual_kg_param):
-    """Calcula emissões do aterro baseado em metodologia IPCC com DOCf variável"""
-    # Parâmetros baseados em IPCC 2006 Waste Model e literatura científica
-    DOC = 0.15  # Carbono orgânico degradável (IPCC padrão para resíduos alimentares)
-    DOC_f = DOCf_val  # AGORA USANDO A EQUAÇÃO DO SEGUNDO SCRIPT
-    F = 0.5      # Fração de CH4 no biogás
-    MCF = 1.0    # Fator de correção de metano para aterros managed (IPCC)
-    OX = 0.1     # Fator de oxidação
-    
-    # Cálculo do potencial de geração de CH4 (IPCC)
-    potencial_CH4_kg = (residuo_anual_kg_param * DOC * DOC_f * F * 
-                       (16/12) * MCF * (1 - OX))
-    
-    # Conversão para CO₂eq usando GWP AR6
-    emissao_CH4_tco2eq = (potencial_CH4_kg * GWP_CH4_20) / 1000
-    
-    # Adicionar emissões de N2O do aterro (estimativa conservadora baseada em IPCC)
-    fator_N2O_aterro = 0.005  # kg N2O/kg resíduo (IPCC para resíduos municipais)
-    emissao_N2O_kg = residuo_anual_kg_param * fator_N2O_aterro
-    emissao_N2O_tco2eq = (emissao_N2O_kg * GWP_N2O_20) / 1000
-    
-    # Total de emissões do aterro
-    emissões_tco2eq_ano = emissao_CH4_tco2eq + emissao_N2O_tco2eq
-    
-    return emissões_tco2eq_ano
-
-def calcular_detalhes_emissoes(residuo_anual_kg_param, residuos_kg_dia_param):
-    """Calcula detalhes completos das emissões para exibição"""
-    # Parâmetros fixos
-    umidade = 0.85
-    fracao_ms = 1 - umidade
-    
-    # CÁLCULO DETALHADO DO ATERRO (IPCC) - COM DOCf VARIÁVEL
-    DOC = 0.15
-    DOC_f = DOCf_val  # AGORA USANDO A EQUAÇÃO
-    F = 0.5
-    MCF = 1.0
-    OX = 0.1
-    
-    potencial_CH4_kg = (residuo_anual_kg_param * DOC * DOC_f * F * 
-                       (16/12) * MCF * (1 - OX))
-    emissao_CH4_tco2eq = (potencial_CH4_kg * GWP_CH4_20) / 1000
-    
-    fator_N2O_aterro = 0.005
-    emissao_N2O_kg = residuo_anual_kg_param * fator_N2O_aterro
-    emissao_N2O_tco2eq = (emissao_N2O_kg * GWP_N2O_20) / 1000
-    
-    aterro_total = emissao_CH4_tco2eq + emissao_N2O_tco2eq
-    
-    # Cálculo detalhado da compostagem (Yang et al. 2017)
-    ch4_kg_dia = residuos_kg_dia_param * (TOC_COMPOSTAGEM_MINHOCAS * CH4_C_FRAC_COMPOSTAGEM_MINHOCAS * (16/12) * fracao_ms)
-    n2o_kg_dia = residuos_kg_dia_param * (TN_COMPOSTAGEM_MINHOCAS * N2O_N_FRAC_COMPOSTAGEM_MINHOCAS * (44/28) * fracao_ms)
-    
-    ch4_kg_ano = ch4_kg_dia * 365
-    n2o_kg_ano = n2o_kg_dia * 365
-    
-    ch4_tco2eq = (ch4_kg_ano * GWP_CH4_20) / 1000
-    n2o_tco2eq = (n2o_kg_ano * GWP_N2O_20) / 1000
-    compostagem_total = ch4_tco2eq + n2o_tco2eq
-    
-    # Emissões evitadas
-    evitadas_total = aterro_total - compostagem_total
-    
-    return {
-        'compostagem': {
-            'ch4_kg_dia': ch4_kg_dia,
-            'n2o_kg_dia': n2o_kg_dia,
-            'ch4_kg_ano': ch4_kg_ano,
-            'n2o_kg_ano': n2o_kg_ano,
-            'ch4_tco2eq': ch4_tco2eq,
-            'n2o_tco2eq': n2o_tco2eq,
-            'total': compostagem_total
-        },
-        'aterro': {
-            'potencial_CH4_kg': potencial_CH4_kg,
-            'emissao_N2O_kg': emissao_N2O_kg,
-            'ch4_tco2eq': emissao_CH4_tco2eq,
-            'n2o_tco2eq': emissao_N2O_tco2eq,
-            'total': aterro_total
-        },
-        'evitadas': evitadas_total,
-        'parametros': {
-            'umidade': umidade,
-            'fracao_ms': fracao_ms,
-            'TOC': TOC_COMPOSTAGEM_MINHOCAS,
-            'TN': TN_COMPOSTAGEM_MINHOCAS,
-            'CH4_frac': CH4_C_FRAC_COMPOSTAGEM_MINHOCAS,
-            'N2O_frac': N2O_N_FRAC_COMPOSTAGEM_MINHOCAS,
-            'GWP_CH4': GWP_CH4_20,
-            'GWP_N2O': GWP_N2O_20,
-            'DOC': DOC,
-            'DOC_f': DOC_f,  # AGORA MOSTRANDO O VALOR CALCULADO
-            'F': F,
-            'MCF': MCF,
-            'OX': OX,
-            'fator_N2O_aterro': fator_N2O_aterro,
-            'temperatura': T  # ADICIONANDO A TEMPERATURA USADA
-        }
-    }
+def base_projecao_metodologias(metodologias, residuo_anual_kg, composicao, temperaturas_mensais, anos_simulacao):
+    """Emissões evitadas de cada combinação de linha de base e GWP (uma linha por combinação)
+
+    Sem climatologia, o valor anual de cada combinação; com climatologia, a
+    série mensal com o DOCf de cada mês (12 × anos_simulacao colunas). A
+    primeira linha é a dos resultados principais.
+    """
+    if temperaturas_mensais is None:
+        return np.asarray(metodologias['evitadas'][0]).reshape(-1)
+    return np.vstack([
+        projetar_evitadas_mensais(residuo_anual_kg, temperaturas_mensais, anos_simulacao, [composicao],
+                                  linha_base=linha_base, conjunto_gwp=conjunto_gwp)
+        for linha_base in metodologias['linhas_base']
+        for conjunto_gwp in metodologias['conjuntos_gwp']
+    ])
 
 # =============================================================================
 # EXECUÇÃO DA SIMULAÇÃO
@@ -531,21 +579,98 @@ def calcular_detalhes_emissoes(residuo_anual_kg_param, residuos_kg_dia_param):
 if st.session_state.get('run_simulation', False):
     st.header("💰 Resultados Financeiros")
     
-    # Cálculos usando os parâmetros da sidebar
-    emissoes_aterro_ano = calcular_emissoes_aterro(residuo_anual_kg)
-    emissoes_compostagem_ano = calcular_emissoes_compostagem_minhocas(residuos_kg_dia)
-    emissoes_evitadas_ano = emissoes_aterro_ano - emissoes_compostagem_ano
-    total_evitado = emissoes_evitadas_ano * anos_simulacao
-    
     # Usar cotações do session state
     preco_carbono_eur = st.session_state.preco_carbono
     taxa_cambio = st.session_state.taxa_cambio
     preco_carbono_brl = preco_carbono_eur * taxa_cambio
     fonte_cotacao = st.session_state.fonte_cotacao
     
-    # Valores financeiros
-    valor_eur = calcular_valor_creditos(total_evitado, preco_carbono_eur)
-    valor_brl = calcular_valor_creditos(total_evitado, preco_carbono_brl)
+    configuracao = {
+        'escola': escola,
+        'capacidade_reator': capacidade_reator,
+        'num_reatores': num_reatores,
+        'ciclos_ano': ciclos_ano,
+        'anos_simulacao': anos_simulacao,
+        'projecao': opcoes_projecao,
+        'composicao': composicao,
+        'temperaturas': None if temperaturas_mensais is None else temperaturas_mensais.tolist()
+    }
+    cotacao = {
+        'preco_carbono': preco_carbono_eur,
+        'taxa_cambio': taxa_cambio,
+        'fonte_cotacao': fonte_cotacao
+    }
+    chave = chave_simulacao(configuracao, cotacao)
+    
+    # Anos equivalentes de operação na capacidade inicial (rampa e expansões)
+    anos_equivalentes = float(projetar(
+        1.0, anos_simulacao,
+        rampa_meses=rampa_meses,
+        expansoes=expansoes
+    )['acumulado'][0, -1])
+    
+    # Configuração + cotação idênticas são servidas do histórico sem recalcular
+    with closing(conectar()) as conexao:
+        simulacao = buscar_simulacao(conexao, chave)
+        
+        if simulacao is None:
+            # Todas as metodologias em uma única passada matricial; os resultados
+            # principais são a primeira combinação (Aterro gerenciado + GWP AR6 20 anos)
+            metodologias = calcular_emissoes_metodologias(
+                residuo_anual_kg, [composicao], temperaturas=temperaturas_mensais
+            )
+            emissoes_aterro_ano = float(metodologias['aterro'][0, 0, 0])
+            emissoes_compostagem_ano = float(metodologias['compostagem'][0, 0, 0])
+            emissoes_evitadas_ano = emissoes_aterro_ano - emissoes_compostagem_ano
+            # Total no horizonte: operação de cada mês (rampa e expansões) × DOCf do mês
+            total_evitado = float(projetar(
+                base_projecao_metodologias(
+                    metodologias, residuo_anual_kg, composicao, temperaturas_mensais, anos_simulacao
+                )[:1],
+                anos_simulacao,
+                rampa_meses=rampa_meses,
+                expansoes=expansoes
+            )['acumulado'][0, -1])
+            
+            simulacao = {
+                'emissoes_aterro_ano': emissoes_aterro_ano,
+                'emissoes_compostagem_ano': emissoes_compostagem_ano,
+                'emissoes_evitadas_ano': emissoes_evitadas_ano,
+                'total_evitado': total_evitado,
+                # Valores financeiros
+                'valor_eur': calcular_valor_creditos(total_evitado, preco_carbono_eur),
+                'valor_brl': calcular_valor_creditos(total_evitado, preco_carbono_brl),
+                # Detalhes completos e comparação de metodologias
+                'detalhes': calcular_detalhes_emissoes(
+                    residuo_anual_kg, residuos_kg_dia, composicao, temperaturas_mensais
+                ),
+                'metodologias': metodologias
+            }
+            salvar_simulacao(conexao, chave, configuracao, cotacao, simulacao)
+        else:
+            st.caption(f"♻️ Resultado recuperado do histórico (calculado em {simulacao['criado_em']})")
+    
+    emissoes_aterro_ano = simulacao['emissoes_aterro_ano']
+    emissoes_compostagem_ano = simulacao['emissoes_compostagem_ano']
+    emissoes_evitadas_ano = simulacao['emissoes_evitadas_ano']
+    total_evitado = simulacao['total_evitado']
+    valor_eur = simulacao['valor_eur']
+    valor_brl = simulacao['valor_brl']
+    detalhes = simulacao['detalhes']
+    metodologias = simulacao['metodologias']
+    
+    # Emissões evitadas de cada metodologia, por período e no horizonte
+    base_metodologias = base_projecao_metodologias(
+        metodologias, residuo_anual_kg, composicao, temperaturas_mensais, anos_simulacao
+    )
+    evitadas_horizonte = projetar(
+        base_metodologias, anos_simulacao,
+        rampa_meses=rampa_meses,
+        expansoes=expansoes
+    )['acumulado'][:, -1].reshape(len(metodologias['linhas_base']), len(metodologias['conjuntos_gwp']))
+    # A compostagem não depende da temperatura; o restante das emissões evitadas é do aterro
+    compostagem_total = emissoes_compostagem_ano * anos_equivalentes
+    aterro_total = total_evitado + compostagem_total
     
     # Métricas principais
     col1, col2, col3 = st.columns(3)
@@ -574,9 +699,6 @@ if st.session_state.get('run_simulation', False):
     # NOVA SEÇÃO: DETALHAMENTO DOS CÁLCULOS
     st.subheader("🧮 Detalhamento dos Cálculos")
     
-    # Calcular detalhes completos
-    detalhes = calcular_detalhes_emissoes(residuo_anual_kg, residuos_kg_dia)
-    
     with st.expander("📊 Ver Detalhes Completo dos Cálculos de Emissões"):
         st.markdown("""
         ### 📈 Base do Cálculo de Emissões Evitadas
@@ -590,12 +712,12 @@ if st.session_state.get('run_simulation', False):
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown("""
+            st.markdown(f"""
             **🏭 Cenário Aterro (Linha de Base):**
             - **Metodologia:** IPCC 2006 Waste Model + Guidelines 2019
             - **Fonte:** Painel Intergovernamental sobre Mudanças Climáticas
             - **Parâmetros IPCC:**
-              • DOC (Carbono Orgânico Degradável): 15%
+              • DOC (Carbono Orgânico Degradável): {formatar_brasil(detalhes['parametros']['DOC'] * 100, 1)}% (mistura)
               • DOCf (Fração Decomposta): Calculado por DOCf = 0.0147 × T + 0.28
               • F (Fração CH₄ no Biogás): 50%
               • MCF (Fator Correção Metano): 1.0
@@ -606,10 +728,10 @@ if st.session_state.get('run_simulation', False):
             **Cálculo CH₄ Aterro:**
             ```
             DOCf = 0.0147 × T + 0.28
-            DOCf = 0.0147 × {detalhes['parametros']['temperatura']} + 0.28 = {formatar_brasil(detalhes['parametros']['DOC_f'], 3)}
+            DOCf = 0.0147 × {formatar_brasil(detalhes['parametros']['temperatura'], 1)} + 0.28 = {formatar_brasil(detalhes['parametros']['DOC_f'], 3)}{'' if temperaturas_mensais is None else ' (média mensal)'}
 
             CH₄ potencial = Resíduo × DOC × DOCf × F × (16/12) × MCF × (1-OX)
-            CH₄ potencial = {formatar_brasil(residuo_anual_kg, 1)} × {detalhes['parametros']['DOC']} × {formatar_brasil(detalhes['parametros']['DOC_f'], 3)} × {detalhes['parametros']['F']} × 1,333 × {detalhes['parametros']['MCF']} × 0,9
+            CH₄ potencial = {formatar_brasil(residuo_anual_kg, 1)} × {formatar_brasil(detalhes['parametros']['DOC'], 3)} × {formatar_brasil(detalhes['parametros']['DOC_f'], 3)} × {detalhes['parametros']['F']} × 1,333 × {detalhes['parametros']['MCF']} × 0,9
             CH₄ potencial = {formatar_brasil(detalhes['aterro']['potencial_CH4_kg'], 1)} kg CH₄/ano
             
             CH₄ em CO₂eq = {formatar_brasil(detalhes['aterro']['potencial_CH4_kg'], 1)} × {detalhes['parametros']['GWP_CH4']}
@@ -643,11 +765,19 @@ if st.session_state.get('run_simulation', False):
             - **GWP:** IPCC AR6 (20 anos)
             """)
             
+            linhas_composicao = "\n            ".join(
+                f"- {nome}: {formatar_brasil(fracao * 100, 1)}%"
+                for nome, fracao in detalhes['parametros']['composicao'].items()
+            )
+            
             st.markdown(f"""
-            **Parâmetros:**
-            - TOC (Carbono Orgânico Total): {detalhes['parametros']['TOC']} kg C/kg resíduo
+            **Composição (frações mássicas):**
+            {linhas_composicao}
+            
+            **Parâmetros da mistura:**
+            - TOC (Carbono Orgânico Total): {formatar_brasil(detalhes['parametros']['TOC'], 3)} kg C/kg resíduo
             - TN (Nitrogênio Total): {formatar_brasil(detalhes['parametros']['TN'] * 1000, 2)} g N/kg resíduo
-            - Umidade: {detalhes['parametros']['umidade'] * 100}%
+            - Umidade: {formatar_brasil(detalhes['parametros']['umidade'] * 100, 1)}%
             - Fração CH₄-C/TOC: {formatar_brasil(detalhes['parametros']['CH4_frac'] * 100, 2)}%
             - Fração N₂O-N/TN: {formatar_brasil(detalhes['parametros']['N2O_frac'] * 100, 2)}%
             """)
@@ -665,7 +795,7 @@ if st.session_state.get('run_simulation', False):
             st.markdown(f"""
             ```
             CH₄ por dia = Resíduo × TOC × (CH₄-C/TOC) × (16/12) × (1-umidade)
-            CH₄ por dia = {formatar_brasil(residuos_kg_dia, 2)} × {detalhes['parametros']['TOC']} × {detalhes['parametros']['CH4_frac']} × 1,333 × {detalhes['parametros']['fracao_ms']}
+            CH₄ por dia = {formatar_brasil(residuos_kg_dia, 2)} × {formatar_brasil(detalhes['parametros']['TOC'], 3)} × {detalhes['parametros']['CH4_frac']} × 1,333 × {formatar_brasil(detalhes['parametros']['fracao_ms'], 3)}
             CH₄ por dia = {formatar_brasil(detalhes['compostagem']['ch4_kg_dia'], 6)} kg/dia
             
             CH₄ anual = {formatar_brasil(detalhes['compostagem']['ch4_kg_dia'], 6)} × 365
@@ -685,7 +815,7 @@ if st.session_state.get('run_simulation', False):
             st.markdown(f"""
             ```
             N₂O por dia = Resíduo × TN × (N₂O-N/TN) × (44/28) × (1-umidade)
-            N₂O por dia = {formatar_brasil(residuos_kg_dia, 2)} × {detalhes['parametros']['TN']} × {detalhes['parametros']['N2O_frac']} × 1,571 × {detalhes['parametros']['fracao_ms']}
+            N₂O por dia = {formatar_brasil(residuos_kg_dia, 2)} × {formatar_brasil(detalhes['parametros']['TN'], 4)} × {detalhes['parametros']['N2O_frac']} × 1,571 × {formatar_brasil(detalhes['parametros']['fracao_ms'], 3)}
             N₂O por dia = {formatar_brasil(detalhes['compostagem']['n2o_kg_dia'], 6)} kg/dia
             
             N₂O anual = {formatar_brasil(detalhes['compostagem']['n2o_kg_dia'], 6)} × 365
@@ -726,13 +856,25 @@ if st.session_state.get('run_simulation', False):
         st.markdown("---")
         st.subheader("📅 Projeção do Projeto")
         
+        if temperaturas_mensais is None:
+            linhas_calculo_total = [
+                "Emissões evitadas totais = Emissões evitadas/ano × Anos equivalentes (rampa e expansões)",
+                f"Emissões evitadas totais = {formatar_brasil(detalhes['evitadas'], 4)} tCO₂eq/ano × "
+                f"{formatar_brasil(anos_equivalentes, 2)} anos"
+            ]
+        else:
+            linhas_calculo_total = [
+                "Emissões evitadas totais = Σ meses (Aterro com DOCf do mês − Compostagem/12) × Operação do mês",
+                f"Operação do mês: rampa e expansões ({formatar_brasil(anos_equivalentes, 2)} anos equivalentes)"
+            ]
+        linhas_calculo_total = ("\n" + " " * 8).join(linhas_calculo_total)
+        
         st.markdown(f"""
         **Período do Projeto:** {anos_simulacao} anos
         
         **Cálculo Final:**
         ```
-        Emissões evitadas totais = Emissões evitadas/ano × Período
-        Emissões evitadas totais = {formatar_brasil(detalhes['evitadas'], 4)} tCO₂eq/ano × {anos_simulacao} anos
+        {linhas_calculo_total}
         Emissões evitadas totais = {formatar_brasil(total_evitado, 4)} tCO₂eq
         ```
         
@@ -755,11 +897,11 @@ if st.session_state.get('run_simulation', False):
         st.markdown(f"""
         **🏭 Cenário Atual (Aterro):**
         - Emissões anuais: {formatar_brasil(emissoes_aterro_ano)} tCO₂eq
-        - Emissões totais: {formatar_brasil(emissoes_aterro_ano * anos_simulacao)} tCO₂eq
+        - Emissões totais: {formatar_brasil(aterro_total)} tCO₂eq
         
         **♻️ Projeto (Compostagem):**
         - Emissões anuais: {formatar_brasil(emissoes_compostagem_ano)} tCO₂eq  
-        - Emissões totais: {formatar_brasil(emissoes_compostagem_ano * anos_simulacao)} tCO₂eq
+        - Emissões totais: {formatar_brasil(compostagem_total)} tCO₂eq
         """)
     
     with col2:
@@ -773,23 +915,105 @@ if st.session_state.get('run_simulation', False):
         - Em Reais: {formatar_brasil(valor_brl, moeda=True, simbolo_moeda="R$")}
         """)
     
-    # Projeção anual
-    st.subheader("📅 Projeção Anual")
+    col1, col2 = st.columns(2)
     
-    projecao_data = []
-    for ano in range(1, anos_simulacao + 1):
-        acumulado_emissoes = emissoes_evitadas_ano * ano
-        acumulado_valor_eur = calcular_valor_creditos(acumulado_emissoes, preco_carbono_eur)
-        acumulado_valor_brl = calcular_valor_creditos(acumulado_emissoes, preco_carbono_brl)
-        
-        projecao_data.append({
-            'Ano': ano,
-            'Emissões Evitadas Acumuladas (tCO₂eq)': formatar_brasil(acumulado_emissoes, 1),
-            'Valor (€)': formatar_brasil(acumulado_valor_eur, moeda=True, simbolo_moeda="€"),
-            'Valor (R$)': formatar_brasil(acumulado_valor_brl, moeda=True, simbolo_moeda="R$")
-        })
+    with col1:
+        st.image(grafico_aterro_vs_compostagem(
+            detalhes['aterro']['ch4_tco2eq'],
+            detalhes['aterro']['n2o_tco2eq'],
+            detalhes['compostagem']['ch4_tco2eq'],
+            detalhes['compostagem']['n2o_tco2eq']
+        ), caption="Emissões anuais por cenário")
     
-    st.dataframe(pd.DataFrame(projecao_data), use_container_width=True)
+    with col2:
+        valor_base, sensibilidade = calcular_sensibilidade(residuo_anual_kg, detalhes['parametros'])
+        st.image(grafico_tornado(
+            [(ROTULOS_PARAMETROS[nome], baixo, alto) for nome, baixo, alto in sensibilidade],
+            valor_base
+        ), caption="Sensibilidade das emissões evitadas anuais aos limites de cada parâmetro")
+    
+    # DOCf mensal a partir da climatologia
+    if temperaturas_mensais is not None:
+        with st.expander("🌡️ DOCf e Emissões Mensais do Aterro"):
+            aterro_mensal = projetar_aterro_mensal(residuo_anual_kg, temperaturas_mensais, 1, [composicao])[0]
+            st.dataframe(pd.DataFrame({
+                'Mês': NOMES_MESES,
+                'Temperatura (°C)': [formatar_brasil(t, 1) for t in temperaturas_mensais],
+                'DOCf': [formatar_brasil(d, 3) for d in calcular_docf(temperaturas_mensais)],
+                'Aterro (tCO₂eq/mês)': [formatar_brasil(e, 4) for e in aterro_mensal]
+            }), use_container_width=True, hide_index=True)
+    
+    # Comparação de metodologias (todas as variantes em uma única passada vetorizada)
+    st.subheader("🧾 Comparação de Metodologias")
+    
+    metodologias_data = []
+    for b, linha_base in enumerate(metodologias['linhas_base']):
+        for w, conjunto_gwp in enumerate(metodologias['conjuntos_gwp']):
+            evitadas_ano = metodologias['evitadas'][0, b, w]
+            metodologias_data.append({
+                'Linha de Base': f"{linha_base} (MCF {formatar_brasil(LINHAS_BASE[linha_base]['MCF'], 1)})",
+                'GWP': conjunto_gwp,
+                'Aterro (tCO₂eq/ano)': formatar_brasil(metodologias['aterro'][0, b, w], 4),
+                'Compostagem (tCO₂eq/ano)': formatar_brasil(metodologias['compostagem'][0, b, w], 4),
+                'Evitadas (tCO₂eq/ano)': formatar_brasil(evitadas_ano, 4),
+                f'Evitadas em {anos_simulacao} anos (tCO₂eq)': formatar_brasil(evitadas_horizonte[b, w], 2),
+                'Valor (R$)': formatar_brasil(
+                    calcular_valor_creditos(evitadas_horizonte[b, w], preco_carbono_brl),
+                    moeda=True, simbolo_moeda="R$"
+                )
+            })
+    
+    st.dataframe(pd.DataFrame(metodologias_data), use_container_width=True, hide_index=True)
+    st.caption("Resultados principais acima: Aterro gerenciado + GWP AR6 20 anos")
+    
+    # Projeção (anual ou mensal), calculada de forma vetorizada
+    rotulo_periodo = 'Ano' if granularidade == 'anual' else 'Mês'
+    st.subheader(f"📅 Projeção {granularidade.capitalize()}")
+    
+    projecao = projetar(
+        base_metodologias[:1], anos_simulacao,
+        granularidade=granularidade,
+        rampa_meses=rampa_meses,
+        expansoes=expansoes,
+        periodo_emissao_meses=periodo_emissao_meses,
+        preco_carbono=preco_carbono_eur
+    )
+    valor_acumulado_eur = projecao['valor_acumulado'][0]
+    valor_acumulado_brl = calcular_valor_creditos(valor_acumulado_eur, taxa_cambio)
+    
+    projecao_data = pd.DataFrame({
+        rotulo_periodo: projecao['periodos'],
+        'Emissões Evitadas no Período (tCO₂eq)': [formatar_brasil(v, 2) for v in projecao['evitadas'][0]],
+        'Emissões Evitadas Acumuladas (tCO₂eq)': [formatar_brasil(v, 1) for v in projecao['acumulado'][0]],
+        'Créditos Emitidos (tCO₂eq)': [formatar_brasil(v, 2) for v in projecao['emitidos'][0]],
+        'Valor (€)': [formatar_brasil(v, moeda=True, simbolo_moeda="€") for v in valor_acumulado_eur],
+        'Valor (R$)': [formatar_brasil(v, moeda=True, simbolo_moeda="R$") for v in valor_acumulado_brl]
+    })
+    
+    st.dataframe(projecao_data, use_container_width=True, hide_index=True)
+    st.caption(f"Valores acumulados dos créditos emitidos a cada {periodo_emissao_meses} meses")
+    
+    st.image(grafico_projecao_anual(
+        projecao['periodos'],
+        projecao['acumulado'][0],
+        valor_acumulado_brl,
+        rotulo_periodo=rotulo_periodo
+    ))
+    
+    with st.expander("🏷️ Safras (vintages) dos Créditos"):
+        st.dataframe(pd.DataFrame({
+            'Safra (ano do projeto)': np.arange(1, anos_simulacao + 1),
+            'Créditos (tCO₂eq)': [formatar_brasil(v, 3) for v in projecao['safras'][0]]
+        }), use_container_width=True, hide_index=True)
+    
+    # Histórico de simulações armazenadas
+    with st.expander("🗂️ Histórico de Simulações"):
+        with closing(conectar()) as conexao:
+            historico = consultar_historico(conexao, escola=escola or None, limite=50)
+        if historico.empty:
+            st.info("Nenhuma simulação armazenada")
+        else:
+            st.dataframe(historico, use_container_width=True, hide_index=True)
 
 else:
     # Tela inicial
@@ -807,6 +1031,8 @@ else:
     
     4. **Clique em "Calcular Créditos de Carbono"** para ver os resultados
     
+    5. **Use "Fixar para Comparação"** para comparar várias configurações lado a lado
+    
     **🌱 Sobre os resíduos processados:**
     - Frutas e verduras de refeitórios escolares
     - Borra de café das cantinas  
@@ -814,6 +1040,101 @@ else:
     - Material orgânico de hortas escolares
     """)
 
+# =============================================================================
+# COMPARAÇÃO DE CENÁRIOS
+# =============================================================================
+
+COLUNAS_CENARIOS = {
+    'capacidade_reator': 'Capacidade (L)',
+    'num_reatores': 'Reatores',
+    'ciclos_ano': 'Ciclos/ano',
+    'anos_simulacao': 'Anos',
+    'rampa_meses': 'Rampa (meses)',
+    'reatores_adicionais': 'Reatores Adicionais',
+    'ano_expansao': 'Ano da Expansão',
+    'preco_carbono': 'Preço Carbono (€/tCO₂eq)',
+    'taxa_cambio': 'Câmbio (R$/€)'
+}
+
+if st.session_state.cenarios_fixados:
+    st.header("🔀 Comparação de Configurações")
+    st.caption(
+        "Edite, adicione ou remova cenários na tabela • composição dos resíduos e "
+        "temperatura atuais são comuns a todos os cenários • totais consideram rampa e expansão"
+    )
+    
+    cenarios_editados = st.data_editor(
+        pd.DataFrame(st.session_state.cenarios_fixados, columns=list(COLUNAS_CENARIOS)).rename(columns=COLUNAS_CENARIOS),
+        key=f"editor_cenarios_{st.session_state.versao_cenarios}",
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'Capacidade (L)': st.column_config.NumberColumn(min_value=20, max_value=100, step=5),
+            'Reatores': st.column_config.NumberColumn(min_value=1, max_value=10, step=1),
+            'Ciclos/ano': st.column_config.NumberColumn(min_value=1, max_value=12, step=1),
+            'Anos': st.column_config.NumberColumn(min_value=1, max_value=HORIZONTE_MAXIMO_ANOS, step=1),
+            'Rampa (meses)': st.column_config.NumberColumn(min_value=0, max_value=24, step=1, default=0),
+            'Reatores Adicionais': st.column_config.NumberColumn(min_value=0, max_value=10, step=1, default=0),
+            'Ano da Expansão': st.column_config.NumberColumn(
+                min_value=1, max_value=HORIZONTE_MAXIMO_ANOS, step=1, default=1
+            ),
+            'Preço Carbono (€/tCO₂eq)': st.column_config.NumberColumn(
+                min_value=0.0, format="%.2f", default=st.session_state.preco_carbono
+            ),
+            'Câmbio (R$/€)': st.column_config.NumberColumn(
+                min_value=0.0, format="%.2f", default=st.session_state.taxa_cambio
+            )
+        }
+    )
+    
+    cenarios = (
+        cenarios_editados
+        .rename(columns={v: k for k, v in COLUNAS_CENARIOS.items()})
+        .dropna(subset=CAMPOS_CENARIO)
+        .to_dict('records')
+    )
+    st.session_state.cenarios_editados = cenarios
+    # Nomes sempre derivados dos valores atuais de cada linha
+    nomes_cenarios = [f"{i}. {nome_cenario(cenario)}" for i, cenario in enumerate(cenarios, start=1)]
+    
+    if cenarios:
+        # Todos os cenários novos ou alterados são avaliados em uma única chamada em lote
+        resultados_cenarios, n_calculados = avaliar_cenarios_com_cache(
+            cenarios, st.session_state.resultados_cenarios, composicao, temperaturas_mensais
+        )
+        
+        valor_referencia = resultados_cenarios[0]['valor_brl']
+        st.dataframe(pd.DataFrame([
+            {
+                'Cenário': nome,
+                'Resíduos (t/ano)': formatar_brasil(resultado['residuo_anual_kg'] / 1000, 2),
+                'Evitadas (tCO₂eq/ano)': formatar_brasil(resultado['emissoes_evitadas_ano'], 4),
+                'Evitadas Totais (tCO₂eq)': formatar_brasil(resultado['total_evitado'], 2),
+                'Valor (€)': formatar_brasil(resultado['valor_eur'], moeda=True, simbolo_moeda="€"),
+                'Valor (R$)': formatar_brasil(resultado['valor_brl'], moeda=True, simbolo_moeda="R$"),
+                'vs. 1º Cenário': (
+                    f"{formatar_brasil((resultado['valor_brl'] / valor_referencia - 1) * 100, 1)}%"
+                    if valor_referencia else "-"
+                )
+            }
+            for nome, resultado in zip(nomes_cenarios, resultados_cenarios)
+        ]), use_container_width=True, hide_index=True)
+        
+        st.image(grafico_comparacao_cenarios(
+            nomes_cenarios,
+            [resultado['total_evitado'] for resultado in resultados_cenarios],
+            [resultado['valor_brl'] for resultado in resultados_cenarios]
+        ))
+        st.caption(f"{n_calculados} de {len(cenarios)} cenários calculados nesta execução; demais reaproveitados")
+    
+    if st.button("🗑️ Limpar Comparação"):
+        st.session_state.cenarios_fixados = []
+        st.session_state.pop('cenarios_editados', None)
+        st.session_state.resultados_cenarios = {}
+        st.session_state.versao_cenarios += 1
+        st.rerun()
+
 # =============================================================================
 # INFORMAÇÕES ADICIONAIS
 # =============================================================================
@@ -830,9 +1151,9 @@ with st.expander("📚 Sobre a Metodologia"):
     
     **Cenário de Referência (Aterro) - IPCC:**
     - **Metodologia:** IPCC 2006 Waste Model
-    - **DOC (Carbono Orgânico Degradável):** 15% para resíduos alimentares
+    - **DOC (Carbono Orgânico Degradável):** 15% para frutas e verduras, ponderado pela composição dos resíduos
     - **DOCf (Fração Decomposta):** Calculado por DOCf = 0.0147 × T + 0.28
-    - **DOCf calculado:** {formatar_brasil(DOCf_val, 3)} (para T = {T}°C)
+    - **DOCf calculado:** {formatar_brasil(docf_efetivo(temperaturas_mensais), 3)} ({f'para T = {T}°C' if temperaturas_mensais is None else 'média das temperaturas mensais'})
     - **F (Fração CH₄ no Biogás):** 50%
     - **MCF (Fator Correção Metano):** 1.0 para aterros gerenciados
     - **OX (Oxidação):** 10%
@@ -844,7 +1165,7 @@ with st.expander("📚 Sobre a Metodologia"):
     - Atualização sob demanda do usuário
     
     **💼 Aplicação Prática:**
-    - Projetos escolares de 4-20 anos
+    - Projetos escolares de 1-100 anos (projeção anual ou mensal)
     - Sistemas modulares de 1-10 reatores
     - Capacidade de 20-100 litros por reator
     - Processamento contínuo ao longo do ano
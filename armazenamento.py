@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from modelo_emissoes import VERSAO_MODELO
+
+# =============================================================================
+# ARMAZENAMENTO PERSISTENTE DAS SIMULAÇÕES (SQLITE)
+# =============================================================================
+
+CAMINHO_BANCO_PADRAO = os.environ.get(
+    "COMPOSTAGEM_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados", "simulacoes.sqlite3")
+)
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS simulacoes (
+    id INTEGER PRIMARY KEY,
+    chave TEXT NOT NULL UNIQUE,
+    criado_em TEXT NOT NULL,
+    escola TEXT NOT NULL DEFAULT '',
+    capacidade_reator REAL NOT NULL,
+    num_reatores INTEGER NOT NULL,
+    ciclos_ano INTEGER NOT NULL,
+    anos_simulacao INTEGER NOT NULL,
+    projecao TEXT,
+    composicao TEXT NOT NULL,
+    temperaturas TEXT,
+    preco_carbono REAL NOT NULL,
+    taxa_cambio REAL NOT NULL,
+    fonte_cotacao TEXT,
+    emissoes_aterro_ano REAL NOT NULL,
+    emissoes_compostagem_ano REAL NOT NULL,
+    emissoes_evitadas_ano REAL NOT NULL,
+    total_evitado REAL NOT NULL,
+    valor_eur REAL NOT NULL,
+    valor_brl REAL NOT NULL,
+    detalhes TEXT NOT NULL,
+    metodologias TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_simulacoes_criado_em ON simulacoes (criado_em);
+CREATE INDEX IF NOT EXISTS idx_simulacoes_configuracao
+    ON simulacoes (capacidade_reator, num_reatores, ciclos_ano, anos_simulacao);
+CREATE INDEX IF NOT EXISTS idx_simulacoes_escola_criado_em
+    ON simulacoes (escola, criado_em, valor_brl);
+"""
+
+COLUNAS_CONFIGURACAO = [
+    'escola', 'capacidade_reator', 'num_reatores', 'ciclos_ano', 'anos_simulacao',
+    'projecao', 'composicao', 'temperaturas'
+]
+COLUNAS_COTACAO = ['preco_carbono', 'taxa_cambio', 'fonte_cotacao']
+COLUNAS_RESULTADOS = [
+    'emissoes_aterro_ano', 'emissoes_compostagem_ano', 'emissoes_evitadas_ano',
+    'total_evitado', 'valor_eur', 'valor_brl'
+]
+COLUNAS_JSON = ['projecao', 'composicao', 'temperaturas', 'detalhes', 'metodologias']
+
+# Colunas adicionadas após a criação do esquema (migradas em bancos existentes)
+COLUNAS_MIGRADAS = {'projecao': 'TEXT'}
+
+# Versão do esquema gravada no banco; incrementar ao alterar ESQUEMA ou COLUNAS_MIGRADAS
+VERSAO_ESQUEMA = 1
+
+def _para_json(valor):
+    """Serializa dicionários/arrays de forma canônica (chaves ordenadas)"""
+    def converter(objeto):
+        if isinstance(objeto, np.ndarray):
+            return objeto.tolist()
+        if isinstance(objeto, np.generic):
+            return objeto.item()
+        raise TypeError(f"Tipo não serializável: {type(objeto).__name__}")
+    return json.dumps(valor, sort_keys=True, ensure_ascii=False, default=converter)
+
+def _preparar_banco(conexao):
+    """Cria tabelas e índices e migra colunas novas, registrando a versão do esquema no banco"""
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.execute("BEGIN IMMEDIATE")
+    try:
+        # Outra conexão pode ter preparado o banco enquanto esperávamos o lock
+        if conexao.execute("PRAGMA user_version").fetchone()[0] != VERSAO_ESQUEMA:
+            for comando in ESQUEMA.split(";"):
+                if comando.strip():
+                    conexao.execute(comando)
+            existentes = {linha['name'] for linha in conexao.execute("PRAGMA table_info(simulacoes)")}
+            for coluna, tipo in COLUNAS_MIGRADAS.items():
+                if coluna not in existentes:
+                    conexao.execute(f"ALTER TABLE simulacoes ADD COLUMN {coluna} {tipo}")
+            conexao.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+        conexao.commit()
+    except Exception:
+        conexao.rollback()
+        raise
+
+def conectar(caminho=None):
+    """Abre o banco de simulações, preparando o esquema se o banco ainda não estiver na versão atual
+
+    A versão fica gravada no próprio arquivo (PRAGMA user_version), então um
+    banco apagado ou substituído durante a execução é preparado de novo.
+    """
+    if caminho is None:
+        caminho = CAMINHO_BANCO_PADRAO
+    if caminho != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    conexao = sqlite3.connect(caminho, timeout=30)
+    conexao.row_factory = sqlite3.Row
+    conexao.execute("PRAGMA synchronous=NORMAL")
+    if conexao.execute("PRAGMA user_version").fetchone()[0] != VERSAO_ESQUEMA:
+        _preparar_banco(conexao)
+    return conexao
+
+def chave_simulacao(configuracao, cotacao):
+    """Gera a chave única (SHA-256) de uma configuração + cotação na versão atual do modelo"""
+    conteudo = _para_json({
+        'versao_modelo': VERSAO_MODELO,
+        'configuracao': {coluna: configuracao.get(coluna) for coluna in COLUNAS_CONFIGURACAO},
+        'cotacao': {coluna: cotacao.get(coluna) for coluna in COLUNAS_COTACAO},
+    })
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+def buscar_simulacao(conexao, chave):
+    """Retorna a simulação armazenada com a chave informada, ou None"""
+    linha = conexao.execute("SELECT * FROM simulacoes WHERE chave = ?", (chave,)).fetchone()
+    if linha is None:
+        return None
+    simulacao = dict(linha)
+    for coluna in COLUNAS_JSON:
+        if simulacao[coluna] is not None:
+            simulacao[coluna] = json.loads(simulacao[coluna])
+    for nome in ('aterro', 'compostagem', 'evitadas'):
+        simulacao['metodologias'][nome] = np.asarray(simulacao['metodologias'][nome])
+    return simulacao
+
+def salvar_simulacao(conexao, chave, configuracao, cotacao, resultados):
+    """Armazena uma simulação (entradas, cotação, saídas e detalhamento)"""
+    registro = {'chave': chave, 'criado_em': datetime.now(timezone.utc).isoformat(timespec='seconds')}
+    registro.update({coluna: configuracao.get(coluna) for coluna in COLUNAS_CONFIGURACAO})
+    registro.update({coluna: cotacao.get(coluna) for coluna in COLUNAS_COTACAO})
+    registro.update({coluna: float(resultados[coluna]) for coluna in COLUNAS_RESULTADOS})
+    registro['detalhes'] = resultados['detalhes']
+    registro['metodologias'] = resultados['metodologias']
+    registro['escola'] = registro['escola'] or ''
+    for coluna in COLUNAS_JSON:
+        if registro[coluna] is not None:
+            registro[coluna] = _para_json(registro[coluna])
+
+    colunas = list(registro)
+    with conexao:
+        conexao.execute(
+            f"INSERT OR IGNORE INTO simulacoes ({', '.join(colunas)}) "
+            f"VALUES ({', '.join('?' for _ in colunas)})",
+            [registro[coluna] for coluna in colunas]
+        )
+
+# =============================================================================
+# CONSULTAS HISTÓRICAS
+# =============================================================================
+
+def consultar_historico(conexao, escola=None, inicio=None, fim=None, limite=100):
+    """Lista as simulações mais recentes (sem o detalhamento), com filtros opcionais"""
+    condicoes, parametros = [], []
+    if escola is not None:
+        condicoes.append("escola = ?")
+        parametros.append(escola)
+    if inicio is not None:
+        condicoes.append("criado_em >= ?")
+        parametros.append(inicio)
+    if fim is not None:
+        condicoes.append("criado_em < ?")
+        parametros.append(fim)
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+
+    colunas = ['criado_em'] + COLUNAS_CONFIGURACAO[:5] + COLUNAS_COTACAO + COLUNAS_RESULTADOS
+    return pd.read_sql_query(
+        f"SELECT {', '.join(colunas)} FROM simulacoes {where} ORDER BY criado_em DESC LIMIT ?",
+        conexao, params=parametros + [limite]
+    )
+
+def valor_por_escola(conexao, escola=None, formato_periodo='%Y-%m'):
+    """Agrega o valor dos créditos (R$) por escola e período de criação da simulação"""
+    where, parametros = "", []
+    if escola is not None:
+        where = "WHERE escola = ?"
+        parametros.append(escola)
+    return pd.read_sql_query(
+        f"""
+        SELECT escola,
+               strftime(?, criado_em) AS periodo,
+               COUNT(*) AS simulacoes,
+               AVG(valor_brl) AS valor_medio_brl,
+               MAX(valor_brl) AS valor_maximo_brl
+        FROM simulacoes {where}
+        GROUP BY escola, periodo
+        ORDER BY escola, periodo
+        """,
+        conexao, params=[formato_periodo] + parametros
+    )
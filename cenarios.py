@@ -0,0 +1,138 @@
+import hashlib
+import json
+
+import numpy as np
+
+from modelo_emissoes import (
+    DENSIDADE_RESIDUO,
+    COMPOSICAO_PADRAO,
+    calcular_valor_creditos,
+    calcular_emissoes_metodologias,
+)
+from projecao import projetar
+from climatologia import projetar_evitadas_mensais
+
+# =============================================================================
+# COMPARAÇÃO DE CENÁRIOS (AVALIAÇÃO EM LOTE)
+# =============================================================================
+
+CAMPOS_CENARIO = [
+    'capacidade_reator', 'num_reatores', 'ciclos_ano', 'anos_simulacao',
+    'rampa_meses', 'reatores_adicionais', 'ano_expansao',
+    'preco_carbono', 'taxa_cambio'
+]
+
+LIMITE_CACHE_CENARIOS = 256
+
+def nome_cenario(cenario):
+    """Nome curto de um cenário, ex.: "3×30L · 6 ciclos · 4 anos · +2 reatores no ano 2\""""
+    nome = (f"{int(cenario['num_reatores'])}×{int(cenario['capacidade_reator'])}L · "
+            f"{int(cenario['ciclos_ano'])} ciclos · {int(cenario['anos_simulacao'])} anos")
+    if cenario['rampa_meses'] > 0:
+        nome += f" · rampa {int(cenario['rampa_meses'])} meses"
+    if cenario['reatores_adicionais'] > 0:
+        nome += f" · +{int(cenario['reatores_adicionais'])} reatores no ano {int(cenario['ano_expansao'])}"
+    return nome
+
+def projetar_totais_cenarios(valores, base):
+    """Emissões evitadas no horizonte de cada cenário, com rampa e expansões
+
+    `base` é o vetor de emissões evitadas anuais na capacidade inicial, ou a
+    matriz mensal (n_cenários, 12 × maior horizonte) com o DOCf sazonal. Todos
+    os cenários são projetados juntos até o maior horizonte; cada um é lido no
+    fim do seu próprio horizonte, como no cálculo principal do app.
+    """
+    anos = valores['anos_simulacao'].astype(int)
+    n = anos.size
+    expansoes = []
+    for i in range(n):
+        mes_expansao = 12 * (int(valores['ano_expansao'][i]) - 1) + 1
+        if valores['reatores_adicionais'][i] > 0 and mes_expansao <= 12 * anos[i]:
+            fator = np.zeros(n)
+            fator[i] = valores['reatores_adicionais'][i] / valores['num_reatores'][i]
+            expansoes.append((mes_expansao, fator))
+    acumulado = projetar(base, int(anos.max()), rampa_meses=valores['rampa_meses'],
+                         expansoes=expansoes)['acumulado']
+    return acumulado[np.arange(n), anos - 1]
+
+def avaliar_cenarios(cenarios, composicao=None, temperaturas=None):
+    """Avalia vários cenários de uma só vez (emissões e valoração vetorizadas)
+
+    Cada cenário é um dicionário com os campos de CAMPOS_CENARIO; composição
+    e temperaturas são comuns a todos. Retorna uma lista de dicionários com
+    os resultados, na mesma ordem dos cenários.
+    """
+    if not cenarios:
+        return []
+    if composicao is None:
+        composicao = COMPOSICAO_PADRAO
+    valores = {campo: np.array([float(c[campo]) for c in cenarios]) for campo in CAMPOS_CENARIO}
+
+    residuo_anual_kg = (valores['capacidade_reator'] * DENSIDADE_RESIDUO *
+                        valores['num_reatores'] * valores['ciclos_ano'])
+    composicoes = np.tile(composicao, (len(cenarios), 1))
+    emissoes = calcular_emissoes_metodologias(
+        residuo_anual_kg,
+        composicoes,
+        linhas_base=['Aterro gerenciado'],
+        conjuntos_gwp=['AR6 20 anos'],
+        temperaturas=temperaturas
+    )
+    aterro_ano = emissoes['aterro'][:, 0, 0]
+    compostagem_ano = emissoes['compostagem'][:, 0, 0]
+    evitadas_ano = emissoes['evitadas'][:, 0, 0]
+    if temperaturas is None:
+        base = evitadas_ano
+    else:
+        base = projetar_evitadas_mensais(residuo_anual_kg, temperaturas,
+                                         int(valores['anos_simulacao'].max()), composicoes)
+    total_evitado = projetar_totais_cenarios(valores, base)
+
+    valor_eur = calcular_valor_creditos(total_evitado, valores['preco_carbono'])
+    valor_brl = calcular_valor_creditos(total_evitado, valores['preco_carbono'], valores['taxa_cambio'])
+
+    return [
+        {
+            'residuo_anual_kg': float(residuo_anual_kg[i]),
+            'emissoes_aterro_ano': float(aterro_ano[i]),
+            'emissoes_compostagem_ano': float(compostagem_ano[i]),
+            'emissoes_evitadas_ano': float(evitadas_ano[i]),
+            'total_evitado': float(total_evitado[i]),
+            'valor_eur': float(valor_eur[i]),
+            'valor_brl': float(valor_brl[i]),
+        }
+        for i in range(len(cenarios))
+    ]
+
+def chave_cenario(cenario, composicao=None, temperaturas=None):
+    """Chave (SHA-256) de um cenário junto com o contexto comum da comparação"""
+    conteudo = json.dumps({
+        'cenario': {campo: float(cenario[campo]) for campo in CAMPOS_CENARIO},
+        'composicao': None if composicao is None else [float(c) for c in composicao],
+        'temperaturas': None if temperaturas is None else [float(t) for t in temperaturas],
+    }, sort_keys=True)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+def avaliar_cenarios_com_cache(cenarios, cache, composicao=None, temperaturas=None):
+    """Avalia os cenários reaproveitando resultados já calculados
+
+    Apenas os cenários ausentes de `cache` (um dicionário, ex.: no session
+    state) são avaliados, todos em uma única chamada em lote. Retorna os
+    resultados na ordem dos cenários e quantos precisaram ser calculados.
+    """
+    chaves = [chave_cenario(c, composicao, temperaturas) for c in cenarios]
+
+    faltantes = {}
+    for chave, cenario in zip(chaves, cenarios):
+        if chave not in cache and chave not in faltantes:
+            faltantes[chave] = cenario
+
+    if faltantes:
+        resultados = avaliar_cenarios(list(faltantes.values()), composicao, temperaturas)
+        cache.update(zip(faltantes, resultados))
+        # Limitar o tamanho do cache, descartando os resultados mais antigos
+        for chave in list(cache)[:max(len(cache) - LIMITE_CACHE_CENARIOS, 0)]:
+            if chave not in chaves:
+                del cache[chave]
+
+    return [cache[chave] for chave in chaves], len(faltantes)
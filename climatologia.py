@@ -0,0 +1,104 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from modelo_emissoes import (
+    calcular_docf,
+    calcular_emissoes_aterro_mensal,
+    calcular_emissoes_metodologias,
+    validar_temperaturas,
+)
+
+# =============================================================================
+# CLIMATOLOGIA LOCAL (TEMPERATURA MENSAL)
+# =============================================================================
+
+CAMINHO_CLIMATOLOGIA_PADRAO = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "dados", "climatologia_ribeirao_preto.csv"
+)
+
+NOMES_MESES = ["Jan", "Fev", "Mar", "Abr", "Mai", "Jun", "Jul", "Ago", "Set", "Out", "Nov", "Dez"]
+
+def _converter_datas(coluna):
+    """Converte datas ISO (AAAA-MM-DD) ou no formato brasileiro com barras (DD/MM/AAAA)"""
+    texto = coluna.astype(str).str.strip()
+    com_barra = texto.str.contains('/', regex=False)
+    datas = pd.Series(pd.NaT, index=coluna.index, dtype='datetime64[ns]')
+    if (~com_barra).any():
+        datas[~com_barra] = pd.to_datetime(texto[~com_barra], format='ISO8601', errors='coerce')
+    if com_barra.any():
+        datas[com_barra] = pd.to_datetime(texto[com_barra], dayfirst=True, errors='coerce')
+    return datas
+
+def carregar_climatologia(fonte=None):
+    """Carrega as temperaturas médias mensais (°C) de um CSV
+
+    Aceita uma climatologia com colunas `mes` (1-12) e `temperatura`, ou uma
+    série diária/mensal com colunas `data` (AAAA-MM-DD ou DD/MM/AAAA) e
+    `temperatura`. A série é reduzida a uma climatologia: média de cada mês
+    do ano entre todos os anos. Retorna um array com 12 valores (Jan-Dez).
+    """
+    if fonte is None:
+        fonte = CAMINHO_CLIMATOLOGIA_PADRAO
+    dados = pd.read_csv(fonte)
+    dados.columns = [str(coluna).strip().lower() for coluna in dados.columns]
+
+    if 'temperatura' not in dados.columns:
+        raise ValueError("O arquivo deve conter a coluna 'temperatura'")
+
+    if 'data' in dados.columns:
+        datas = _converter_datas(dados['data'])
+        if datas.isna().any():
+            raise ValueError("A coluna 'data' contém valores inválidos")
+        meses = datas.dt.month
+    elif 'mes' in dados.columns:
+        meses = pd.to_numeric(dados['mes'], errors='coerce')
+        if not meses.isin(range(1, 13)).all():
+            raise ValueError("A coluna 'mes' deve conter apenas inteiros de 1 a 12")
+        meses = meses.astype(int)
+    else:
+        raise ValueError("O arquivo deve conter a coluna 'mes' ou 'data'")
+
+    temperaturas = pd.to_numeric(dados['temperatura'], errors='coerce')
+    if temperaturas.isna().any():
+        raise ValueError("A coluna 'temperatura' contém valores vazios ou não numéricos")
+    validar_temperaturas(temperaturas.to_numpy())
+
+    medias = temperaturas.groupby(meses).mean().reindex(range(1, 13))
+    if medias.isna().any():
+        raise ValueError("O arquivo deve ter temperaturas para os 12 meses do ano")
+    return medias.to_numpy(dtype=float)
+
+def serie_mensal(temperaturas_mensais, n_meses, mes_inicial=1):
+    """Repete a climatologia mensal para formar uma série de `n_meses` a partir de `mes_inicial`"""
+    temperaturas_mensais = np.asarray(temperaturas_mensais, dtype=float)
+    indices = (np.arange(n_meses) + mes_inicial - 1) % temperaturas_mensais.size
+    return temperaturas_mensais[indices]
+
+def projetar_aterro_mensal(residuo_anual_kg, temperaturas_mensais, n_anos, composicoes=None,
+                           mes_inicial=1, **metodologia):
+    """Projeta as emissões mensais do aterro (tCO₂eq) de muitas escolas por vários anos
+
+    O DOCf de cada mês vem da tabela pré-calculada; o resultado tem formato
+    (n_escolas, 12 × n_anos).
+    """
+    temperaturas = serie_mensal(temperaturas_mensais, 12 * n_anos, mes_inicial)
+    docf_mensal = calcular_docf(temperaturas)
+    residuo_mensal_kg = np.asarray(residuo_anual_kg, dtype=float) / 12
+    return calcular_emissoes_aterro_mensal(residuo_mensal_kg, docf_mensal, composicoes, **metodologia)
+
+def projetar_evitadas_mensais(residuo_anual_kg, temperaturas_mensais, n_anos, composicoes=None,
+                              mes_inicial=1, linha_base='Aterro gerenciado', conjunto_gwp='AR6 20 anos'):
+    """Emissões evitadas de cada mês (tCO₂eq) na capacidade inicial, com o DOCf sazonal do aterro
+
+    Aterro do mês (DOCf da temperatura do mês) menos 1/12 da compostagem anual,
+    que não depende da temperatura; formato (n_escolas, 12 × n_anos), pronto
+    para `projecao.projetar`.
+    """
+    aterro = projetar_aterro_mensal(residuo_anual_kg, temperaturas_mensais, n_anos, composicoes,
+                                    mes_inicial, linha_base=linha_base, conjunto_gwp=conjunto_gwp)
+    compostagem = calcular_emissoes_metodologias(
+        residuo_anual_kg, composicoes, linhas_base=[linha_base], conjuntos_gwp=[conjunto_gwp]
+    )['compostagem'][:, 0, 0]
+    return aterro - compostagem.reshape(-1, 1) / 12
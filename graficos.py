@@ -0,0 +1,223 @@
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import seaborn as sns
+from matplotlib.figure import Figure
+
+# =============================================================================
+# CACHE DE GRÁFICOS RENDERIZADOS (BYTES)
+# =============================================================================
+
+class CacheGraficos:
+    """Cache LRU de imagens renderizadas, limitado pelo total de bytes
+
+    Compartilhado entre sessões do Streamlit (mesmo processo), por isso o
+    acesso é protegido por lock; a renderização ocorre fora do lock. Se uma
+    chave já está sendo renderizada, as demais chamadas esperam por ela em
+    vez de renderizar a mesma imagem de novo.
+    """
+
+    def __init__(self, limite_bytes=64 * 1024 * 1024):
+        self.limite_bytes = limite_bytes
+        self._itens = OrderedDict()
+        self._em_andamento = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+
+    def _buscar(self, chave):
+        """Retorna os bytes da chave e a marca como recente (chamar com o lock)"""
+        if chave in self._itens:
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return self._itens[chave]
+        return None
+
+    def obter(self, chave, gerar):
+        """Retorna os bytes da chave, renderizando com `gerar()` se ausente"""
+        with self._lock:
+            conteudo = self._buscar(chave)
+            if conteudo is not None:
+                return conteudo
+            renderizacao = self._em_andamento.get(chave)
+            if renderizacao is None:
+                renderizacao = self._em_andamento[chave] = threading.Event()
+                self.faltas += 1
+                responsavel = True
+            else:
+                responsavel = False
+
+        if not responsavel:
+            renderizacao.wait()
+            with self._lock:
+                conteudo = self._buscar(chave)
+            # Renderização falhou ou a imagem não coube no cache: renderizar aqui
+            return conteudo if conteudo is not None else gerar()
+
+        try:
+            conteudo = gerar()
+            with self._lock:
+                if len(conteudo) <= self.limite_bytes:
+                    self._itens[chave] = conteudo
+                    self._total_bytes += len(conteudo)
+                    while self._total_bytes > self.limite_bytes:
+                        _, removido = self._itens.popitem(last=False)
+                        self._total_bytes -= len(removido)
+            return conteudo
+        finally:
+            with self._lock:
+                del self._em_andamento[chave]
+            renderizacao.set()
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self._total_bytes = 0
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def __len__(self):
+        return len(self._itens)
+
+CACHE_GRAFICOS = CacheGraficos()
+
+FORMATOS = {'png': 'png', 'svg': 'svg'}
+
+def _chave(nome, formato, entradas):
+    """Hash das entradas do gráfico"""
+    def converter(objeto):
+        if isinstance(objeto, np.ndarray):
+            return objeto.tolist()
+        if isinstance(objeto, np.generic):
+            return objeto.item()
+        raise TypeError(f"Tipo não serializável: {type(objeto).__name__}")
+    conteudo = json.dumps([nome, formato, entradas], sort_keys=True, ensure_ascii=False, default=converter)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+def _renderizar(figura, formato):
+    """Salva a figura em memória e retorna os bytes"""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconhecido: {formato}")
+    buffer = io.BytesIO()
+    figura.savefig(buffer, format=FORMATOS[formato], dpi=120, bbox_inches='tight')
+    return buffer.getvalue()
+
+def _em_cache(nome, formato, entradas, desenhar, cache=None):
+    if cache is None:
+        cache = CACHE_GRAFICOS
+    return cache.obter(_chave(nome, formato, entradas), lambda: _renderizar(desenhar(), formato))
+
+# =============================================================================
+# GRÁFICOS
+# =============================================================================
+
+def grafico_projecao_anual(anos, evitadas_acumuladas, valor_acumulado_brl, rotulo_periodo="Ano",
+                           formato='png', cache=None):
+    """Projeção: emissões evitadas acumuladas (barras) e valor acumulado em R$ (linha) por período"""
+    anos = np.asarray(anos)
+    evitadas_acumuladas = np.asarray(evitadas_acumuladas, dtype=float)
+    valor_acumulado_brl = np.asarray(valor_acumulado_brl, dtype=float)
+
+    def desenhar():
+        cores = sns.color_palette("Set2")
+        figura = Figure(figsize=(8, 3.8))
+        ax = figura.subplots()
+        ax.bar(anos, evitadas_acumuladas, color=cores[0], label="Emissões evitadas acumuladas")
+        ax.set_xlabel(rotulo_periodo)
+        ax.set_ylabel("tCO₂eq")
+
+        ax_valor = ax.twinx()
+        ax_valor.plot(anos, valor_acumulado_brl, color=cores[1], marker='o' if anos.size <= 40 else None,
+                      label="Valor acumulado (R$)")
+        ax_valor.set_ylabel("R$")
+
+        linhas = ax.get_legend_handles_labels()
+        linhas_valor = ax_valor.get_legend_handles_labels()
+        ax.legend(linhas[0] + linhas_valor[0], linhas[1] + linhas_valor[1], loc='upper left', frameon=False)
+        sns.despine(ax=ax, right=False)
+        figura.tight_layout()
+        return figura
+
+    entradas = {'anos': anos, 'evitadas': evitadas_acumuladas, 'valor': valor_acumulado_brl,
+                'rotulo': rotulo_periodo}
+    return _em_cache('projecao_anual', formato, entradas, desenhar, cache)
+
+def grafico_aterro_vs_compostagem(aterro_ch4, aterro_n2o, compostagem_ch4, compostagem_n2o,
+                                  formato='png', cache=None):
+    """Emissões anuais por cenário (tCO₂eq), empilhadas por gás"""
+    def desenhar():
+        cores = sns.color_palette("Set2")
+        figura = Figure(figsize=(6, 3.8))
+        ax = figura.subplots()
+        cenarios = ["Aterro", "Compostagem"]
+        ch4 = np.array([aterro_ch4, compostagem_ch4], dtype=float)
+        n2o = np.array([aterro_n2o, compostagem_n2o], dtype=float)
+        ax.bar(cenarios, ch4, color=cores[2], label="CH₄")
+        ax.bar(cenarios, n2o, bottom=ch4, color=cores[3], label="N₂O")
+        ax.set_ylabel("tCO₂eq/ano")
+        ax.legend(frameon=False)
+        sns.despine(ax=ax)
+        figura.tight_layout()
+        return figura
+
+    entradas = [aterro_ch4, aterro_n2o, compostagem_ch4, compostagem_n2o]
+    return _em_cache('aterro_vs_compostagem', formato, entradas, desenhar, cache)
+
+def grafico_tornado(sensibilidade, valor_base, formato='png', cache=None):
+    """Gráfico tornado: variação das emissões evitadas com cada parâmetro em seus limites
+
+    `sensibilidade` é uma lista de (nome, valor_no_limite_inferior, valor_no_limite_superior).
+    """
+    ordenada = sorted(sensibilidade, key=lambda item: abs(item[2] - item[1]))
+
+    def desenhar():
+        cores = sns.color_palette("Set2")
+        figura = Figure(figsize=(7, 0.45 * len(ordenada) + 1.2))
+        ax = figura.subplots()
+        nomes = [item[0] for item in ordenada]
+        baixos = np.array([item[1] for item in ordenada], dtype=float) - valor_base
+        altos = np.array([item[2] for item in ordenada], dtype=float) - valor_base
+        posicoes = np.arange(len(ordenada))
+        ax.barh(posicoes, baixos, color=cores[1], label="Limite inferior")
+        ax.barh(posicoes, altos, color=cores[0], label="Limite superior")
+        ax.axvline(0, color='black', linewidth=0.8)
+        ax.set_yticks(posicoes, nomes)
+        ax.set_xlabel("Variação das emissões evitadas (tCO₂eq/ano)")
+        ax.legend(frameon=False, loc='lower right')
+        sns.despine(ax=ax, left=True)
+        figura.tight_layout()
+        return figura
+
+    entradas = {'sensibilidade': [list(item) for item in ordenada], 'base': valor_base}
+    return _em_cache('tornado', formato, entradas, desenhar, cache)
+
+def grafico_comparacao_cenarios(nomes, total_evitado, valor_brl, formato='png', cache=None):
+    """Comparação de cenários: emissões evitadas totais e valor dos créditos (R$)"""
+    nomes = list(nomes)
+    total_evitado = np.asarray(total_evitado, dtype=float)
+    valor_brl = np.asarray(valor_brl, dtype=float)
+
+    def desenhar():
+        cores = sns.color_palette("Set2")
+        figura = Figure(figsize=(10, 0.5 * len(nomes) + 1.5))
+        ax_emissoes, ax_valor = figura.subplots(1, 2, sharey=True)
+        posicoes = np.arange(len(nomes))
+        ax_emissoes.barh(posicoes, total_evitado, color=cores[0])
+        ax_emissoes.set_yticks(posicoes, nomes)
+        ax_emissoes.invert_yaxis()
+        ax_emissoes.set_xlabel("Emissões evitadas totais (tCO₂eq)")
+        ax_valor.barh(posicoes, valor_brl, color=cores[1])
+        ax_valor.set_xlabel("Valor dos créditos (R$)")
+        sns.despine(figura)
+        figura.tight_layout()
+        return figura
+
+    entradas = {'nomes': nomes, 'evitadas': total_evitado, 'valor': valor_brl}
+    return _em_cache('comparacao_cenarios', formato, entradas, desenhar, cache)
@@ -0,0 +1,365 @@
+import numpy as np
+
+# =============================================================================
+# PARÂMETROS TÉCNICOS FIXOS (ATUALIZADOS COM DOCf VARIÁVEL)
+# =============================================================================
+
+# Versão do modelo: incrementar ao alterar constantes ou equações, para que
+# resultados armazenados com a versão anterior não sejam reaproveitados
+VERSAO_MODELO = 2
+
+# Parâmetros para cálculos de emissões (baseados em literatura científica)
+T = 25  # Temperatura média
+
+# Cálculo do DOCf baseado na temperatura (equação do segundo script)
+DOCf_val = 0.0147 * T + 0.28
+
+# Tabela de DOCf pré-calculada em uma grade de temperaturas (°C), usada para
+# consultas vetorizadas em séries mensais/diárias longas
+TEMPERATURA_MIN_TABELA = -10.0
+TEMPERATURA_MAX_TABELA = 45.0
+PASSO_TABELA = 0.01
+GRADE_TEMPERATURA = np.round(
+    np.arange(TEMPERATURA_MIN_TABELA, TEMPERATURA_MAX_TABELA + PASSO_TABELA / 2, PASSO_TABELA), 2
+)
+TABELA_DOCf = 0.0147 * GRADE_TEMPERATURA + 0.28
+
+# Compostagem com minhocas (Yang et al. 2017)
+TOC_COMPOSTAGEM_MINHOCAS = 0.436
+TN_COMPOSTAGEM_MINHOCAS = 14.2 / 1000
+CH4_C_FRAC_COMPOSTAGEM_MINHOCAS = 0.13 / 100
+N2O_N_FRAC_COMPOSTAGEM_MINHOCAS = 0.92 / 100
+
+# GWP (IPCC AR6)
+GWP_CH4_20 = 79.7
+GWP_N2O_20 = 273
+
+# Conjuntos de GWP para comparação entre metodologias (CH₄ não fóssil)
+CONJUNTOS_GWP = {
+    'AR6 20 anos': {'CH4': GWP_CH4_20, 'N2O': GWP_N2O_20},
+    'AR6 100 anos': {'CH4': 27.0, 'N2O': 273},
+    'AR5 20 anos': {'CH4': 84, 'N2O': 264},
+    'AR5 100 anos': {'CH4': 28, 'N2O': 265},
+}
+
+# Densidade dos resíduos escolares (kg/L)
+DENSIDADE_RESIDUO = 0.5
+
+# Parâmetros do aterro (IPCC 2006 Waste Model)
+UMIDADE_RESIDUO = 0.85  # 85% - típico para frutas/verduras
+DOC_ATERRO = 0.15       # Carbono orgânico degradável (IPCC padrão para resíduos alimentares)
+F_ATERRO = 0.5          # Fração de CH4 no biogás
+MCF_ATERRO = 1.0        # Fator de correção de metano para aterros managed (IPCC)
+OX_ATERRO = 0.1         # Fator de oxidação
+FATOR_N2O_ATERRO = 0.005  # kg N2O/kg resíduo (IPCC para resíduos municipais)
+
+# Linhas de base alternativas (IPCC 2006, Vol. 5, Tabelas 3.1 e 3.2)
+LINHAS_BASE = {
+    'Aterro gerenciado': {'MCF': MCF_ATERRO, 'OX': OX_ATERRO},
+    'Aterro semiaeróbio': {'MCF': 0.5, 'OX': OX_ATERRO},
+    'Lixão profundo': {'MCF': 0.8, 'OX': 0.0},
+    'Lixão raso': {'MCF': 0.4, 'OX': 0.0},
+}
+
+# =============================================================================
+# COMPOSIÇÃO DOS RESÍDUOS (MODELO DE MISTURA)
+# =============================================================================
+
+# Propriedades por componente: umidade, TOC e TN em base seca (kg/kg MS),
+# DOC em base úmida (kg C/kg resíduo). Frutas e verduras mantêm o perfil
+# original do simulador; demais componentes com valores típicos de literatura.
+PROPRIEDADES_COMPONENTES = {
+    'Frutas e verduras': {
+        'umidade': UMIDADE_RESIDUO,
+        'TOC': TOC_COMPOSTAGEM_MINHOCAS,
+        'TN': TN_COMPOSTAGEM_MINHOCAS,
+        'DOC': DOC_ATERRO,
+    },
+    'Borra de café': {
+        'umidade': 0.60,
+        'TOC': 0.50,
+        'TN': 20.0 / 1000,
+        'DOC': 0.20,
+    },
+    'Restos de refeitório': {
+        'umidade': 0.70,
+        'TOC': 0.46,
+        'TN': 30.0 / 1000,
+        'DOC': 0.15,
+    },
+}
+
+COMPONENTES_RESIDUO = list(PROPRIEDADES_COMPONENTES)
+
+# Composição padrão (frações mássicas, mesma ordem de COMPONENTES_RESIDUO)
+COMPOSICAO_PADRAO = [1.0, 0.0, 0.0]
+
+# =============================================================================
+# CÁLCULOS BASEADOS EM IPCC (ATUALIZADOS)
+# =============================================================================
+
+def calcular_valor_creditos(emissoes_evitadas_tco2eq, preco_carbono_por_tonelada, taxa_cambio=1):
+    """Calcula o valor financeiro das emissões evitadas"""
+    return emissoes_evitadas_tco2eq * preco_carbono_por_tonelada * taxa_cambio
+
+def validar_temperaturas(temperaturas):
+    """Garante que as temperaturas (°C) estão dentro da faixa da tabela de DOCf"""
+    temperaturas = np.asarray(temperaturas, dtype=float)
+    fora = ~((temperaturas >= TEMPERATURA_MIN_TABELA) & (temperaturas <= TEMPERATURA_MAX_TABELA))
+    if fora.any():
+        raise ValueError(
+            f"Temperaturas fora da faixa de {TEMPERATURA_MIN_TABELA:g} a {TEMPERATURA_MAX_TABELA:g} °C "
+            f"(ex.: {temperaturas[fora].flat[0]:g}); verifique se os valores estão em °C"
+        )
+
+def calcular_docf(temperaturas):
+    """Consulta o DOCf na tabela pré-calculada para um array de temperaturas (°C)"""
+    temperaturas = np.asarray(temperaturas, dtype=float)
+    validar_temperaturas(temperaturas)
+    indices = np.rint((temperaturas - TEMPERATURA_MIN_TABELA) / PASSO_TABELA).astype(np.intp)
+    return TABELA_DOCf[indices]
+
+def docf_efetivo(temperaturas=None):
+    """DOCf médio de uma série de temperaturas (massa de resíduo igual em cada período)"""
+    if temperaturas is None:
+        return DOCf_val
+    return float(calcular_docf(temperaturas).mean())
+
+def normalizar_composicao(composicoes):
+    """Converte composições (escolas × componentes) em frações que somam 1 por linha"""
+    C = np.atleast_2d(np.asarray(composicoes, dtype=float))
+    if C.shape[-1] != len(COMPONENTES_RESIDUO):
+        raise ValueError(
+            f"Composição deve ter {len(COMPONENTES_RESIDUO)} componentes: {COMPONENTES_RESIDUO}"
+        )
+    totais = C.sum(axis=1, keepdims=True)
+    if np.any(C < 0) or np.any(totais <= 0):
+        raise ValueError("Composição deve ter frações não negativas com soma positiva")
+    return C / totais
+
+def propriedades_mistura(composicao=None):
+    """Calcula as propriedades efetivas (umidade, TOC, TN, DOC) de uma mistura de componentes"""
+    if composicao is None:
+        composicao = COMPOSICAO_PADRAO
+    c = normalizar_composicao(composicao)[0]
+    umidades = np.array([PROPRIEDADES_COMPONENTES[nome]['umidade'] for nome in COMPONENTES_RESIDUO])
+    massa_seca = c * (1 - umidades)  # kg MS de cada componente por kg de mistura
+
+    umidade = float(c @ umidades)
+    fracao_ms = 1 - umidade
+    return {
+        'composicao': dict(zip(COMPONENTES_RESIDUO, c.tolist())),
+        'umidade': umidade,
+        'TOC': float(massa_seca @ [PROPRIEDADES_COMPONENTES[n]['TOC'] for n in COMPONENTES_RESIDUO]) / fracao_ms,
+        'TN': float(massa_seca @ [PROPRIEDADES_COMPONENTES[n]['TN'] for n in COMPONENTES_RESIDUO]) / fracao_ms,
+        'DOC': float(c @ [PROPRIEDADES_COMPONENTES[n]['DOC'] for n in COMPONENTES_RESIDUO]),
+    }
+
+def calcular_detalhes_emissoes(residuo_anual_kg_param, residuos_kg_dia_param, composicao=None,
+                               temperaturas=None):
+    """Calcula detalhes completos das emissões para exibição"""
+    # Propriedades da mistura
+    mistura = propriedades_mistura(composicao)
+    umidade = mistura['umidade']
+    fracao_ms = 1 - umidade
+
+    # CÁLCULO DETALHADO DO ATERRO (IPCC) - COM DOCf VARIÁVEL
+    DOC = mistura['DOC']
+    DOC_f = docf_efetivo(temperaturas)  # AGORA USANDO A EQUAÇÃO
+    F = F_ATERRO
+    MCF = MCF_ATERRO
+    OX = OX_ATERRO
+
+    potencial_CH4_kg = (residuo_anual_kg_param * DOC * DOC_f * F *
+                       (16/12) * MCF * (1 - OX))
+    emissao_CH4_tco2eq = (potencial_CH4_kg * GWP_CH4_20) / 1000
+
+    fator_N2O_aterro = FATOR_N2O_ATERRO
+    emissao_N2O_kg = residuo_anual_kg_param * fator_N2O_aterro
+    emissao_N2O_tco2eq = (emissao_N2O_kg * GWP_N2O_20) / 1000
+
+    aterro_total = emissao_CH4_tco2eq + emissao_N2O_tco2eq
+
+    # Cálculo detalhado da compostagem (Yang et al. 2017)
+    ch4_kg_dia = residuos_kg_dia_param * (mistura['TOC'] * CH4_C_FRAC_COMPOSTAGEM_MINHOCAS * (16/12) * fracao_ms)
+    n2o_kg_dia = residuos_kg_dia_param * (mistura['TN'] * N2O_N_FRAC_COMPOSTAGEM_MINHOCAS * (44/28) * fracao_ms)
+
+    ch4_kg_ano = ch4_kg_dia * 365
+    n2o_kg_ano = n2o_kg_dia * 365
+
+    ch4_tco2eq = (ch4_kg_ano * GWP_CH4_20) / 1000
+    n2o_tco2eq = (n2o_kg_ano * GWP_N2O_20) / 1000
+    compostagem_total = ch4_tco2eq + n2o_tco2eq
+
+    # Emissões evitadas
+    evitadas_total = aterro_total - compostagem_total
+
+    return {
+        'compostagem': {
+            'ch4_kg_dia': ch4_kg_dia,
+            'n2o_kg_dia': n2o_kg_dia,
+            'ch4_kg_ano': ch4_kg_ano,
+            'n2o_kg_ano': n2o_kg_ano,
+            'ch4_tco2eq': ch4_tco2eq,
+            'n2o_tco2eq': n2o_tco2eq,
+            'total': compostagem_total
+        },
+        'aterro': {
+            'potencial_CH4_kg': potencial_CH4_kg,
+            'emissao_N2O_kg': emissao_N2O_kg,
+            'ch4_tco2eq': emissao_CH4_tco2eq,
+            'n2o_tco2eq': emissao_N2O_tco2eq,
+            'total': aterro_total
+        },
+        'evitadas': evitadas_total,
+        'parametros': {
+            'umidade': umidade,
+            'fracao_ms': fracao_ms,
+            'composicao': mistura['composicao'],
+            'TOC': mistura['TOC'],
+            'TN': mistura['TN'],
+            'CH4_frac': CH4_C_FRAC_COMPOSTAGEM_MINHOCAS,
+            'N2O_frac': N2O_N_FRAC_COMPOSTAGEM_MINHOCAS,
+            'GWP_CH4': GWP_CH4_20,
+            'GWP_N2O': GWP_N2O_20,
+            'DOC': DOC,
+            'DOC_f': DOC_f,  # AGORA MOSTRANDO O VALOR CALCULADO
+            'F': F,
+            'MCF': MCF,
+            'OX': OX,
+            'fator_N2O_aterro': fator_N2O_aterro,
+            'temperatura': T if temperaturas is None else float(np.mean(temperaturas))  # ADICIONANDO A TEMPERATURA USADA
+        }
+    }
+
+# =============================================================================
+# AVALIAÇÃO MATRICIAL DA MISTURA (MUITAS ESCOLAS)
+# =============================================================================
+
+def _matriz_propriedades():
+    """Matriz componentes × [massa, TOC·MS, TN·MS, DOC], por kg de resíduo úmido"""
+    linhas = []
+    for nome in COMPONENTES_RESIDUO:
+        p = PROPRIEDADES_COMPONENTES[nome]
+        fracao_ms = 1 - p['umidade']
+        linhas.append([1.0, p['TOC'] * fracao_ms, p['TN'] * fracao_ms, p['DOC']])
+    return np.array(linhas)
+
+def _matriz_gases(MCF=MCF_ATERRO, OX=OX_ATERRO, DOC_f=DOCf_val):
+    """Matriz propriedades × gases [CH₄ aterro, N₂O aterro, CH₄ compostagem, N₂O compostagem] (kg/kg)"""
+    G = np.zeros((4, 4))
+    G[0, 1] = FATOR_N2O_ATERRO
+    G[1, 2] = CH4_C_FRAC_COMPOSTAGEM_MINHOCAS * (16/12)
+    G[2, 3] = N2O_N_FRAC_COMPOSTAGEM_MINHOCAS * (44/28)
+    G[3, 0] = DOC_f * F_ATERRO * (16/12) * MCF * (1 - OX)
+    return G
+
+def _matriz_co2eq(gwp_ch4=GWP_CH4_20, gwp_n2o=GWP_N2O_20):
+    """Matriz gases × cenários [aterro, compostagem] em tCO₂eq/kg de gás"""
+    return np.array([
+        [gwp_ch4, 0.0],
+        [gwp_n2o, 0.0],
+        [0.0, gwp_ch4],
+        [0.0, gwp_n2o],
+    ]) / 1000
+
+def calcular_emissoes_metodologias(residuo_anual_kg_param, composicoes=None,
+                                   linhas_base=None, conjuntos_gwp=None, temperaturas=None):
+    """Calcula emissões anuais (tCO₂eq) para todas as combinações de linha de base e GWP
+
+    Linhas de base e conjuntos de GWP são eixos extras de broadcast: os arrays
+    retornados têm formato (n_escolas, n_linhas_base, n_conjuntos_gwp).
+    """
+    if composicoes is None:
+        composicoes = COMPOSICAO_PADRAO
+    if linhas_base is None:
+        linhas_base = list(LINHAS_BASE)
+    if conjuntos_gwp is None:
+        conjuntos_gwp = list(CONJUNTOS_GWP)
+
+    C = normalizar_composicao(composicoes)
+    propriedades = C @ _matriz_propriedades()  # (n_escolas, 4)
+
+    DOC_f = docf_efetivo(temperaturas)
+    G = np.stack([_matriz_gases(**LINHAS_BASE[nome], DOC_f=DOC_f) for nome in linhas_base])  # (b, 4, 4)
+    W = np.stack([
+        _matriz_co2eq(CONJUNTOS_GWP[nome]['CH4'], CONJUNTOS_GWP[nome]['N2O'])
+        for nome in conjuntos_gwp
+    ], axis=-1)  # (gases, cenários, w)
+
+    residuo = np.asarray(residuo_anual_kg_param, dtype=float).reshape(-1, 1, 1)
+    gases_kg = np.einsum('ep,bpg->ebg', propriedades, G) * residuo
+    emissoes = np.einsum('ebg,gsw->ebsw', gases_kg, W)  # (e, b, cenários, w)
+
+    aterro = emissoes[:, :, 0, :]
+    compostagem = emissoes[:, :, 1, :]
+    return {
+        'linhas_base': list(linhas_base),
+        'conjuntos_gwp': list(conjuntos_gwp),
+        'aterro': aterro,
+        'compostagem': compostagem,
+        'evitadas': aterro - compostagem,
+    }
+
+def calcular_emissoes_aterro_mensal(residuo_mensal_kg_param, docf_mensal, composicoes=None,
+                                    linha_base='Aterro gerenciado', conjunto_gwp='AR6 20 anos'):
+    """Calcula emissões mensais do aterro (tCO₂eq) para muitas escolas ao longo do tempo
+
+    `residuo_mensal_kg_param` tem formato (n_escolas,) e `docf_mensal` (n_meses,);
+    o resultado tem formato (n_escolas, n_meses).
+    """
+    if composicoes is None:
+        composicoes = COMPOSICAO_PADRAO
+    DOC = normalizar_composicao(composicoes) @ _matriz_propriedades()[:, 3]  # (n_escolas,)
+    base = LINHAS_BASE[linha_base]
+    gwp = CONJUNTOS_GWP[conjunto_gwp]
+
+    residuo = np.asarray(residuo_mensal_kg_param, dtype=float).reshape(-1, 1)
+    fator_CH4 = DOC.reshape(-1, 1) * F_ATERRO * (16/12) * base['MCF'] * (1 - base['OX']) * gwp['CH4']
+    ch4_tco2eq = residuo * fator_CH4 * np.asarray(docf_mensal, dtype=float) / 1000
+    n2o_tco2eq = residuo * FATOR_N2O_ATERRO * gwp['N2O'] / 1000
+    return ch4_tco2eq + n2o_tco2eq
+
+# =============================================================================
+# AVALIAÇÃO VETORIZADA PARA ANÁLISE DE INCERTEZA
+# =============================================================================
+
+# Valores fixos dos parâmetros do modelo, por nome
+PARAMETROS_PADRAO = {
+    'umidade': UMIDADE_RESIDUO,
+    'TOC': TOC_COMPOSTAGEM_MINHOCAS,
+    'TN': TN_COMPOSTAGEM_MINHOCAS,
+    'CH4_frac': CH4_C_FRAC_COMPOSTAGEM_MINHOCAS,
+    'N2O_frac': N2O_N_FRAC_COMPOSTAGEM_MINHOCAS,
+    'temperatura': T,
+    'DOC': DOC_ATERRO,
+    'F': F_ATERRO,
+    'MCF': MCF_ATERRO,
+    'OX': OX_ATERRO,
+    'fator_N2O_aterro': FATOR_N2O_ATERRO,
+}
+
+def calcular_emissoes_evitadas_parametros(residuo_anual_kg_param, parametros):
+    """Calcula emissões evitadas (tCO₂eq/ano) para vetores de parâmetros amostrados
+
+    `parametros` é um dicionário nome -> array (todas com o mesmo formato);
+    parâmetros ausentes usam PARAMETROS_PADRAO.
+    """
+    p = dict(PARAMETROS_PADRAO)
+    p.update(parametros)
+
+    fracao_ms = 1 - np.asarray(p['umidade'])
+    DOC_f = 0.0147 * np.asarray(p['temperatura']) + 0.28
+
+    # Cenário aterro (IPCC)
+    potencial_CH4_kg = (residuo_anual_kg_param * p['DOC'] * DOC_f * p['F'] *
+                        (16/12) * p['MCF'] * (1 - p['OX']))
+    emissao_N2O_kg = residuo_anual_kg_param * p['fator_N2O_aterro']
+    aterro = (potencial_CH4_kg * GWP_CH4_20 + emissao_N2O_kg * GWP_N2O_20) / 1000
+
+    # Cenário compostagem (Yang et al. 2017)
+    ch4_kg_ano = residuo_anual_kg_param * p['TOC'] * p['CH4_frac'] * (16/12) * fracao_ms
+    n2o_kg_ano = residuo_anual_kg_param * p['TN'] * p['N2O_frac'] * (44/28) * fracao_ms
+    compostagem = (ch4_kg_ano * GWP_CH4_20 + n2o_kg_ano * GWP_N2O_20) / 1000
+
+    return aterro - compostagem
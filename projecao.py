@@ -0,0 +1,88 @@
+import numpy as np
+
+# =============================================================================
+# MOTOR DE PROJEÇÃO (MENSAL/ANUAL, HORIZONTES LONGOS, CARTEIRAS)
+# =============================================================================
+
+HORIZONTE_MAXIMO_ANOS = 100
+
+def _fator_capacidade(n_escolas, n_meses, expansoes):
+    """Capacidade relativa à inicial em cada mês (degraus acumulados das expansões)"""
+    incrementos = np.zeros((n_escolas, n_meses))
+    for mes_inicio, fator_adicional in expansoes or []:
+        if not 1 <= mes_inicio <= n_meses:
+            raise ValueError(f"Expansão fora do horizonte: mês {mes_inicio}")
+        incrementos[:, mes_inicio - 1] += fator_adicional
+    return 1 + np.cumsum(incrementos, axis=1)
+
+def projetar(emissoes_evitadas_ano, horizonte_anos, granularidade='anual', rampa_meses=0,
+             expansoes=None, periodo_emissao_meses=12, preco_carbono=0.0, taxa_cambio=1.0):
+    """Projeta emissões evitadas, emissão de créditos e valor ao longo do horizonte
+
+    `emissoes_evitadas_ano` é escalar ou vetor (n_escolas,) com as emissões
+    evitadas por ano na capacidade inicial, ou uma matriz (n_escolas, 12 ×
+    horizonte_anos) com as emissões evitadas de cada mês na capacidade
+    inicial (ex.: DOCf sazonal). `rampa_meses` é escalar ou por escola.
+    `expansoes` é uma lista de (mês, fator adicional de capacidade), com o
+    fator escalar ou por escola. Os créditos
+    são emitidos ao fim de cada período de verificação de `periodo_emissao_meses`.
+
+    Retorna um dicionário de arrays (n_escolas, n_períodos); a safra (vintage)
+    de cada crédito é o ano em que a emissão foi evitada.
+    """
+    if not 1 <= horizonte_anos <= HORIZONTE_MAXIMO_ANOS:
+        raise ValueError(f"Horizonte deve estar entre 1 e {HORIZONTE_MAXIMO_ANOS} anos")
+    if granularidade not in ('anual', 'mensal'):
+        raise ValueError(f"Granularidade desconhecida: {granularidade}")
+    if periodo_emissao_meses < 1:
+        raise ValueError("Período de emissão deve ter ao menos 1 mês")
+
+    n_meses = 12 * int(horizonte_anos)
+    meses = np.arange(1, n_meses + 1)
+    base = np.asarray(emissoes_evitadas_ano, dtype=float)
+    if base.ndim == 2:
+        if base.shape[1] != n_meses:
+            raise ValueError(f"A série mensal deve ter {n_meses} meses (recebido {base.shape[1]})")
+        base_mes = base
+    else:
+        base_mes = np.atleast_1d(base).reshape(-1, 1) / 12
+    n_escolas = base_mes.shape[0]
+
+    # Rampa linear de operação (escalar ou por escola) e degraus de expansão
+    rampa_meses = np.atleast_1d(np.asarray(rampa_meses, dtype=float)).reshape(-1, 1)
+    rampa = np.minimum(meses / np.where(rampa_meses > 0, rampa_meses, 1.0), 1.0)
+    capacidade = _fator_capacidade(n_escolas, n_meses, expansoes)
+    evitadas_mes = base_mes * capacidade * rampa
+
+    # Emissão de créditos ao fim de cada período de verificação (e no último mês)
+    fim_periodo = (meses % periodo_emissao_meses == 0) | (meses == n_meses)
+    acumulado_mes = np.cumsum(evitadas_mes, axis=1)
+    ultimo_fim = np.maximum.accumulate(np.where(fim_periodo, meses - 1, -1))
+    emitidos_acumulados_mes = np.where(ultimo_fim >= 0, acumulado_mes[:, np.maximum(ultimo_fim, 0)], 0.0)
+    emitidos_mes = np.diff(emitidos_acumulados_mes, axis=1, prepend=0.0)
+
+    # Safras: créditos por ano de redução
+    safras = evitadas_mes.reshape(n_escolas, int(horizonte_anos), 12).sum(axis=2)
+
+    if granularidade == 'anual':
+        periodos = np.arange(1, int(horizonte_anos) + 1)
+        evitadas = safras
+        acumulado = acumulado_mes[:, 11::12]
+        emitidos = emitidos_mes.reshape(n_escolas, int(horizonte_anos), 12).sum(axis=2)
+        emitidos_acumulados = emitidos_acumulados_mes[:, 11::12]
+    else:
+        periodos = meses
+        evitadas = evitadas_mes
+        acumulado = acumulado_mes
+        emitidos = emitidos_mes
+        emitidos_acumulados = emitidos_acumulados_mes
+
+    return {
+        'periodos': periodos,
+        'evitadas': evitadas,
+        'acumulado': acumulado,
+        'emitidos': emitidos,
+        'emitidos_acumulados': emitidos_acumulados,
+        'valor_acumulado': emitidos_acumulados * preco_carbono * taxa_cambio,
+        'safras': safras,
+    }
@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pytest
+
+import amostragem
+from amostragem import _caminho_bloco, executar_amostragem
+
+N_AMOSTRAS = 2_500
+TAMANHO_BLOCO = 400
+RESIDUO_ANUAL_KG = 270
+
+def _executar(diretorio, **kwargs):
+    return executar_amostragem(str(diretorio), N_AMOSTRAS, RESIDUO_ANUAL_KG, semente=42,
+                               tamanho_bloco=TAMANHO_BLOCO, **kwargs)
+
+def test_resultado_identico_para_qualquer_numero_de_processos(tmp_path):
+    serial = _executar(tmp_path / "serial", n_processos=1)
+    paralelo = _executar(tmp_path / "paralelo", n_processos=4)
+
+    assert serial['amostras'].shape == (N_AMOSTRAS, len(serial['parametros']))
+    np.testing.assert_array_equal(serial['amostras'], paralelo['amostras'])
+    np.testing.assert_array_equal(serial['evitadas'], paralelo['evitadas'])
+
+def test_retomada_apos_perder_um_bloco(tmp_path):
+    completo = _executar(tmp_path, n_processos=1)
+
+    os.remove(_caminho_bloco(str(tmp_path), 3))
+    retomado = _executar(tmp_path, n_processos=2)
+
+    assert os.path.exists(_caminho_bloco(str(tmp_path), 3))
+    np.testing.assert_array_equal(completo['amostras'], retomado['amostras'])
+    np.testing.assert_array_equal(completo['evitadas'], retomado['evitadas'])
+
+def test_configuracao_diferente_no_mesmo_diretorio(tmp_path):
+    _executar(tmp_path, n_processos=1)
+    with pytest.raises(ValueError, match="configuração diferente"):
+        executar_amostragem(str(tmp_path), N_AMOSTRAS, RESIDUO_ANUAL_KG, semente=7,
+                            tamanho_bloco=TAMANHO_BLOCO, n_processos=1)
+
+def test_versao_do_modelo_diferente_no_mesmo_diretorio(tmp_path, monkeypatch):
+    _executar(tmp_path, n_processos=1)
+    os.remove(_caminho_bloco(str(tmp_path), 0))
+    monkeypatch.setattr(amostragem, 'VERSAO_MODELO', amostragem.VERSAO_MODELO + 1)
+    with pytest.raises(ValueError, match="configuração diferente"):
+        _executar(tmp_path, n_processos=1)
+
+@pytest.mark.parametrize("argumentos", [
+    {'n_amostras': 0},
+    {'tamanho_bloco': 0},
+    {'n_processos': 0},
+])
+def test_entradas_nao_positivas(tmp_path, argumentos):
+    parametros = {'n_amostras': 10, 'tamanho_bloco': 5, 'n_processos': 1, **argumentos}
+    with pytest.raises(ValueError):
+        executar_amostragem(str(tmp_path), residuo_anual_kg=RESIDUO_ANUAL_KG, **parametros)
+    assert not os.path.exists(tmp_path / "manifesto.json")
@@ -0,0 +1,131 @@
+import os
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+import pytest
+
+import armazenamento
+from armazenamento import (
+    ESQUEMA,
+    buscar_simulacao,
+    chave_simulacao,
+    conectar,
+    consultar_historico,
+    salvar_simulacao,
+    valor_por_escola,
+)
+from modelo_emissoes import calcular_detalhes_emissoes, calcular_emissoes_metodologias
+
+CONFIGURACAO = {
+    'escola': 'EMEF Teste',
+    'capacidade_reator': 30,
+    'num_reatores': 3,
+    'ciclos_ano': 6,
+    'anos_simulacao': 4,
+    'projecao': {'granularidade': 'anual', 'rampa_meses': 0, 'expansoes': [], 'periodo_emissao_meses': 12},
+    'composicao': [1.0, 0.0, 0.0],
+    'temperaturas': None,
+}
+COTACAO = {'preco_carbono': 85.5, 'taxa_cambio': 5.5, 'fonte_cotacao': 'Teste'}
+
+def _resultados(valor_brl=3043.2):
+    metodologias = calcular_emissoes_metodologias(270.0, [[1, 0, 0]])
+    return {
+        'emissoes_aterro_ano': metodologias['aterro'][0, 0, 0],
+        'emissoes_compostagem_ano': metodologias['compostagem'][0, 0, 0],
+        'emissoes_evitadas_ano': metodologias['evitadas'][0, 0, 0],
+        'total_evitado': 6.47,
+        'valor_eur': valor_brl / 5.5,
+        'valor_brl': valor_brl,
+        'detalhes': calcular_detalhes_emissoes(270.0, 270.0 / 365),
+        'metodologias': metodologias,
+    }
+
+@pytest.fixture
+def conexao(tmp_path):
+    with closing(conectar(str(tmp_path / "simulacoes.sqlite3"))) as conexao:
+        yield conexao
+
+def test_salvar_e_buscar(conexao):
+    resultados = _resultados()
+    chave = chave_simulacao(CONFIGURACAO, COTACAO)
+    assert buscar_simulacao(conexao, chave) is None
+
+    salvar_simulacao(conexao, chave, CONFIGURACAO, COTACAO, resultados)
+    simulacao = buscar_simulacao(conexao, chave)
+
+    assert simulacao['escola'] == 'EMEF Teste'
+    assert simulacao['projecao'] == CONFIGURACAO['projecao']
+    assert simulacao['temperaturas'] is None
+    assert simulacao['valor_brl'] == pytest.approx(3043.2)
+    assert simulacao['detalhes']['aterro']['total'] == pytest.approx(resultados['detalhes']['aterro']['total'])
+    for nome in ('aterro', 'compostagem', 'evitadas'):
+        assert isinstance(simulacao['metodologias'][nome], np.ndarray)
+        np.testing.assert_allclose(simulacao['metodologias'][nome], resultados['metodologias'][nome])
+    assert simulacao['metodologias']['linhas_base'] == resultados['metodologias']['linhas_base']
+
+def test_chave_repetida_mantem_o_primeiro_resultado(conexao):
+    chave = chave_simulacao(CONFIGURACAO, COTACAO)
+    salvar_simulacao(conexao, chave, CONFIGURACAO, COTACAO, _resultados(100.0))
+    salvar_simulacao(conexao, chave, CONFIGURACAO, COTACAO, _resultados(200.0))
+
+    assert buscar_simulacao(conexao, chave)['valor_brl'] == 100.0
+    assert len(consultar_historico(conexao)) == 1
+
+def test_chave_muda_com_configuracao_cotacao_e_versao_do_modelo(monkeypatch):
+    chave = chave_simulacao(CONFIGURACAO, COTACAO)
+    assert chave == chave_simulacao(dict(CONFIGURACAO), dict(COTACAO))
+    assert chave != chave_simulacao(dict(CONFIGURACAO, ciclos_ano=7), COTACAO)
+    assert chave != chave_simulacao(dict(CONFIGURACAO, temperaturas=[25.0] * 12), COTACAO)
+    assert chave != chave_simulacao(CONFIGURACAO, dict(COTACAO, taxa_cambio=5.6))
+
+    monkeypatch.setattr(armazenamento, 'VERSAO_MODELO', armazenamento.VERSAO_MODELO + 1)
+    assert chave != chave_simulacao(CONFIGURACAO, COTACAO)
+
+def test_migracao_de_banco_sem_coluna_projecao(tmp_path):
+    caminho = str(tmp_path / "antigo.sqlite3")
+    with closing(sqlite3.connect(caminho)) as antigo:
+        antigo.executescript(ESQUEMA.replace("    projecao TEXT,\n", ""))
+
+    with closing(conectar(caminho)) as conexao:
+        colunas = {linha['name'] for linha in conexao.execute("PRAGMA table_info(simulacoes)")}
+        assert 'projecao' in colunas
+        chave = chave_simulacao(CONFIGURACAO, COTACAO)
+        salvar_simulacao(conexao, chave, CONFIGURACAO, COTACAO, _resultados())
+        assert buscar_simulacao(conexao, chave)['projecao'] == CONFIGURACAO['projecao']
+
+def test_banco_apagado_durante_a_execucao_e_recriado(tmp_path):
+    caminho = str(tmp_path / "simulacoes.sqlite3")
+    with closing(conectar(caminho)) as conexao:
+        assert consultar_historico(conexao).empty
+
+    for arquivo in os.listdir(tmp_path):
+        os.remove(tmp_path / arquivo)
+
+    with closing(conectar(caminho)) as conexao:
+        assert consultar_historico(conexao).empty
+
+def test_valor_por_escola(conexao):
+    registros = [
+        ('EMEF A', 100.0, '2026-01-10T10:00:00+00:00'),
+        ('EMEF A', 300.0, '2026-01-20T10:00:00+00:00'),
+        ('EMEF A', 50.0, '2026-02-05T10:00:00+00:00'),
+        ('EMEF B', 80.0, '2026-01-15T10:00:00+00:00'),
+    ]
+    for ciclos_ano, (escola, valor_brl, criado_em) in enumerate(registros, start=1):
+        configuracao = dict(CONFIGURACAO, escola=escola, ciclos_ano=ciclos_ano)
+        chave = chave_simulacao(configuracao, COTACAO)
+        salvar_simulacao(conexao, chave, configuracao, COTACAO, _resultados(valor_brl))
+        with conexao:
+            conexao.execute("UPDATE simulacoes SET criado_em = ? WHERE chave = ?", (criado_em, chave))
+
+    agregado = valor_por_escola(conexao)
+    assert agregado[['escola', 'periodo', 'simulacoes']].values.tolist() == [
+        ['EMEF A', '2026-01', 2], ['EMEF A', '2026-02', 1], ['EMEF B', '2026-01', 1]
+    ]
+    assert agregado['valor_medio_brl'].tolist() == [200.0, 50.0, 80.0]
+    assert agregado['valor_maximo_brl'].tolist() == [300.0, 50.0, 80.0]
+
+    so_b = valor_por_escola(conexao, escola='EMEF B', formato_periodo='%Y')
+    assert so_b[['periodo', 'simulacoes']].values.tolist() == [['2026', 1]]
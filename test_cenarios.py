@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from cenarios import avaliar_cenarios, avaliar_cenarios_com_cache
+from climatologia import carregar_climatologia, projetar_evitadas_mensais
+from modelo_emissoes import DENSIDADE_RESIDUO
+from projecao import projetar
+
+CENARIO = {
+    'capacidade_reator': 30, 'num_reatores': 3, 'ciclos_ano': 6, 'anos_simulacao': 4,
+    'rampa_meses': 6, 'reatores_adicionais': 2, 'ano_expansao': 2,
+    'preco_carbono': 85.5, 'taxa_cambio': 5.5
+}
+
+@pytest.mark.parametrize("com_climatologia", [False, True])
+def test_total_igual_a_projecao_do_cenario_isolado(com_climatologia):
+    temperaturas = carregar_climatologia() if com_climatologia else None
+    outro = dict(CENARIO, anos_simulacao=10, rampa_meses=0, reatores_adicionais=0)
+    resultados = avaliar_cenarios([CENARIO, outro], temperaturas=temperaturas)
+
+    residuo = 30 * DENSIDADE_RESIDUO * 3 * 6
+    if temperaturas is None:
+        base = resultados[0]['emissoes_evitadas_ano']
+    else:
+        base = projetar_evitadas_mensais(residuo, temperaturas, 4)
+    esperado = projetar(base, 4, rampa_meses=6, expansoes=[(13, 2 / 3)])['acumulado'][0, -1]
+
+    np.testing.assert_allclose(resultados[0]['total_evitado'], esperado)
+    np.testing.assert_allclose(resultados[0]['valor_brl'], esperado * 85.5 * 5.5)
+    np.testing.assert_allclose(resultados[1]['total_evitado'], 10 * resultados[1]['emissoes_evitadas_ano'])
+
+def test_cache_recalcula_apenas_cenarios_alterados():
+    cache = {}
+    cenarios = [CENARIO, dict(CENARIO, num_reatores=5)]
+    _, n_calculados = avaliar_cenarios_com_cache(cenarios, cache)
+    assert n_calculados == 2
+
+    cenarios[1] = dict(CENARIO, num_reatores=6)
+    resultados, n_calculados = avaliar_cenarios_com_cache(cenarios, cache)
+    assert n_calculados == 1
+    assert resultados == avaliar_cenarios(cenarios)
@@ -0,0 +1,57 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from climatologia import carregar_climatologia, projetar_evitadas_mensais
+from modelo_emissoes import calcular_emissoes_metodologias
+from projecao import projetar
+
+def _csv(dados):
+    return io.StringIO(pd.DataFrame(dados).to_csv(index=False))
+
+CLIMATOLOGIA = "mes,temperatura\n" + "".join(f"{mes},{20 + mes}\n" for mes in range(1, 13))
+
+def test_climatologia_padrao():
+    temperaturas = carregar_climatologia()
+    assert temperaturas.shape == (12,)
+
+@pytest.mark.parametrize("formato", ["%Y-%m-%d", "%d/%m/%Y"])
+def test_serie_diaria_vira_media_de_cada_mes(formato):
+    datas = pd.date_range("2020-01-01", "2021-12-31")
+    valores = 20 + datas.month + (datas.year - 2020)
+    temperaturas = carregar_climatologia(_csv({'data': datas.strftime(formato), 'temperatura': valores}))
+    esperado = pd.Series(valores).groupby(datas.month).mean().to_numpy()
+    np.testing.assert_allclose(temperaturas, esperado)
+    assert temperaturas[0] == 21.5
+
+def test_serie_mensal_iso():
+    datas = pd.date_range("2020-01-01", periods=24, freq="MS")
+    temperaturas = carregar_climatologia(_csv({'data': datas.strftime("%Y-%m-%d"), 'temperatura': datas.month}))
+    np.testing.assert_allclose(temperaturas, np.arange(1, 13))
+
+@pytest.mark.parametrize("linha_extra", ["13,99\n", "0,20\n", "1.5,20\n", ",20\n", "1,abc\n", "1,\n", "2,77\n"])
+def test_linhas_invalidas_sao_rejeitadas(linha_extra):
+    with pytest.raises(ValueError):
+        carregar_climatologia(io.StringIO(CLIMATOLOGIA + linha_extra))
+
+def test_meses_faltantes():
+    with pytest.raises(ValueError, match="12 meses"):
+        carregar_climatologia(io.StringIO("mes,temperatura\n1,20\n2,21\n"))
+
+def test_evitadas_mensais_com_docf_sazonal():
+    temperaturas = carregar_climatologia()
+    mensais = projetar_evitadas_mensais(270.0, temperaturas, 3, [[1, 0, 0]])
+
+    assert mensais.shape == (1, 36)
+    # Meses mais quentes têm DOCf maior e, portanto, mais emissões evitadas
+    assert np.argmax(mensais[0, :12]) == np.argmax(temperaturas)
+    np.testing.assert_allclose(mensais[0, :12], mensais[0, 12:24])
+    # A soma de cada ano equivale ao cálculo anual com o DOCf médio
+    anual = calcular_emissoes_metodologias(270.0, [[1, 0, 0]], temperaturas=temperaturas)['evitadas'][0, 0, 0]
+    np.testing.assert_allclose(mensais.reshape(3, 12).sum(axis=1), anual)
+
+    projecao = projetar(mensais, 3, granularidade='mensal', periodo_emissao_meses=6)
+    np.testing.assert_allclose(projecao['evitadas'], mensais)
+    np.testing.assert_allclose(projecao['emitidos'][0, 5], mensais[0, :6].sum())
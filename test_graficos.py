@@ -0,0 +1,57 @@
+import threading
+import time
+
+import pytest
+
+from graficos import CacheGraficos, grafico_aterro_vs_compostagem
+
+def test_lru_limitado_por_bytes():
+    cache = CacheGraficos(limite_bytes=10)
+    cache.obter('a', lambda: b'aaaa')
+    cache.obter('b', lambda: b'bbbb')
+    assert cache.obter('a', lambda: pytest.fail("'a' deveria estar em cache")) == b'aaaa'
+
+    # 'b' é o menos recente e sai para abrir espaço para 'c'
+    cache.obter('c', lambda: b'cccc')
+    assert len(cache) == 2
+    assert cache.total_bytes == 8
+    assert cache.obter('b', lambda: b'BBBB') == b'BBBB'
+    assert cache.obter('c', lambda: pytest.fail("'c' deveria estar em cache")) == b'cccc'
+
+    # Imagens maiores que o limite são retornadas, mas não armazenadas
+    assert cache.obter('grande', lambda: b'x' * 11) == b'x' * 11
+    assert 'grande' not in cache._itens
+    assert cache.total_bytes <= 10
+
+def test_renderizacoes_concorrentes_da_mesma_chave_esperam_a_primeira():
+    cache = CacheGraficos()
+    chamadas = []
+
+    def gerar():
+        chamadas.append(1)
+        time.sleep(0.2)
+        return b'imagem'
+
+    resultados = []
+    threads = [threading.Thread(target=lambda: resultados.append(cache.obter('k', gerar))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(chamadas) == 1
+    assert resultados == [b'imagem'] * 8
+    assert (cache.faltas, cache.acertos) == (1, 7)
+
+def test_falha_na_renderizacao_nao_bloqueia_a_chave():
+    cache = CacheGraficos()
+    with pytest.raises(RuntimeError):
+        cache.obter('k', lambda: (_ for _ in ()).throw(RuntimeError("falhou")))
+    assert cache.obter('k', lambda: b'ok') == b'ok'
+
+def test_grafico_renderizado_uma_vez_por_entrada():
+    cache = CacheGraficos()
+    png = grafico_aterro_vs_compostagem(1.5, 0.1, 0.01, 0.002, cache=cache)
+    assert png.startswith(b'\x89PNG')
+    assert grafico_aterro_vs_compostagem(1.5, 0.1, 0.01, 0.002, cache=cache) is png
+    assert (cache.faltas, cache.acertos) == (1, 1)
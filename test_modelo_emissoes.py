@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from climatologia import carregar_climatologia
+from modelo_emissoes import calcular_detalhes_emissoes, calcular_emissoes_metodologias
+
+RESIDUO_ANUAL_KG = 270
+
+COMPOSICOES = [[1, 0, 0], [0, 1, 0], [0, 0, 1], [0.5, 0.3, 0.2]]
+
+@pytest.mark.parametrize("composicao", COMPOSICOES)
+@pytest.mark.parametrize("temperaturas", [None, "climatologia", [12.0] * 6 + [31.0] * 6])
+def test_detalhamento_igual_a_avaliacao_matricial(composicao, temperaturas):
+    if temperaturas == "climatologia":
+        temperaturas = carregar_climatologia()
+    detalhes = calcular_detalhes_emissoes(RESIDUO_ANUAL_KG, RESIDUO_ANUAL_KG / 365, composicao, temperaturas)
+    metodologias = calcular_emissoes_metodologias(RESIDUO_ANUAL_KG, [composicao], temperaturas=temperaturas)
+
+    np.testing.assert_allclose(metodologias['aterro'][0, 0, 0], detalhes['aterro']['total'])
+    np.testing.assert_allclose(metodologias['compostagem'][0, 0, 0], detalhes['compostagem']['total'])
+    np.testing.assert_allclose(metodologias['evitadas'][0, 0, 0], detalhes['evitadas'])
+
+def test_eixos_de_linha_de_base_e_gwp():
+    residuos = np.array([100.0, 270.0, 540.0])
+    metodologias = calcular_emissoes_metodologias(residuos, COMPOSICOES[:3])
+
+    n_linhas, n_gwp = len(metodologias['linhas_base']), len(metodologias['conjuntos_gwp'])
+    assert (n_linhas, n_gwp) == (4, 4)
+    for nome in ('aterro', 'compostagem', 'evitadas'):
+        assert metodologias[nome].shape == (3, n_linhas, n_gwp)
+
+    # Primeira combinação: resultados principais (Aterro gerenciado + AR6 20 anos)
+    assert metodologias['linhas_base'][0] == 'Aterro gerenciado'
+    assert metodologias['conjuntos_gwp'][0] == 'AR6 20 anos'
+    for i, (residuo, composicao) in enumerate(zip(residuos, COMPOSICOES[:3])):
+        detalhes = calcular_detalhes_emissoes(residuo, residuo / 365, composicao)
+        np.testing.assert_allclose(metodologias['evitadas'][i, 0, 0], detalhes['evitadas'])
+
+def test_variante_calculada_a_mao():
+    # 1 t de frutas e verduras, lixão raso (MCF 0,4; OX 0), GWP AR5 100 anos (CH₄ 28; N₂O 265), T = 25 °C
+    metodologias = calcular_emissoes_metodologias(
+        1000.0, [[1, 0, 0]], linhas_base=['Lixão raso'], conjuntos_gwp=['AR5 100 anos']
+    )
+    # Aterro: CH₄ = 1000 × 0,15 DOC × 0,6475 DOCf × 0,5 F × 16/12 × 0,4 MCF = 25,9 kg; N₂O = 1000 × 0,005 = 5 kg
+    aterro = (25.9 * 28 + 5 * 265) / 1000
+    # Compostagem: CH₄ = 1000 × 0,436 TOC × 0,15 MS × 0,0013 × 16/12; N₂O = 1000 × 0,0142 TN × 0,15 MS × 0,0092 × 44/28
+    compostagem = (1000 * 0.436 * 0.15 * 0.0013 * 16 / 12 * 28 +
+                   1000 * 0.0142 * 0.15 * 0.0092 * 44 / 28 * 265) / 1000
+
+    assert metodologias['aterro'].shape == (1, 1, 1)
+    np.testing.assert_allclose(metodologias['aterro'][0, 0, 0], aterro)
+    np.testing.assert_allclose(metodologias['compostagem'][0, 0, 0], compostagem)
+    np.testing.assert_allclose(metodologias['evitadas'][0, 0, 0], aterro - compostagem)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from projecao import HORIZONTE_MAXIMO_ANOS, projetar
+
+def test_acumulado_anual_sem_rampa():
+    projecao = projetar(2.0, 4)
+
+    np.testing.assert_allclose(projecao['evitadas'], [[2.0, 2.0, 2.0, 2.0]])
+    np.testing.assert_allclose(projecao['acumulado'], [[2.0, 4.0, 6.0, 8.0]])
+    np.testing.assert_allclose(projecao['safras'], projecao['evitadas'])
+
+@pytest.mark.parametrize("base", [1.5, -1.5])
+def test_emissao_ao_fim_de_cada_periodo_de_verificacao(base):
+    # Períodos de 24 meses em 5 anos: emissões nos meses 24, 48 e 60 (último mês)
+    projecao = projetar(base, 5, granularidade='mensal', periodo_emissao_meses=24)
+
+    meses_com_emissao = np.flatnonzero(projecao['emitidos'][0]) + 1
+    np.testing.assert_array_equal(meses_com_emissao, [24, 48, 60])
+    np.testing.assert_allclose(projecao['emitidos'][0, [23, 47, 59]], [2 * base, 2 * base, base])
+    np.testing.assert_allclose(projecao['emitidos_acumulados'][0, -1], projecao['acumulado'][0, -1])
+
+    anual = projetar(base, 5, periodo_emissao_meses=24, preco_carbono=10.0, taxa_cambio=2.0)
+    np.testing.assert_allclose(anual['emitidos_acumulados'], base * np.array([[0, 2, 2, 4, 5]]))
+    np.testing.assert_allclose(anual['emitidos'], base * np.array([[0, 2, 0, 2, 1]]))
+    np.testing.assert_allclose(anual['valor_acumulado'], anual['emitidos_acumulados'] * 20.0)
+
+def test_rampa_e_expansao():
+    projecao = projetar(12.0, 2, granularidade='mensal', rampa_meses=12, expansoes=[(13, 1.0)])
+
+    # Rampa linear de 1/12 a 12/12 no primeiro ano; capacidade dobrada no segundo
+    np.testing.assert_allclose(projecao['evitadas'][0, :12], np.arange(1, 13) / 12)
+    np.testing.assert_allclose(projecao['evitadas'][0, 12:], 2.0)
+    np.testing.assert_allclose(projecao['safras'], [[6.5, 24.0]])
+
+def test_varias_escolas_equivalem_a_projecoes_individuais():
+    bases = np.array([1.0, 2.0, 3.0])
+    rampas = np.array([0, 6, 12])
+    expansoes = [(13, np.array([0.0, 0.5, 1.0]))]
+    conjunto = projetar(bases, 3, granularidade='mensal', rampa_meses=rampas,
+                        expansoes=expansoes, periodo_emissao_meses=6)
+
+    for i in range(bases.size):
+        individual = projetar(bases[i], 3, granularidade='mensal', rampa_meses=rampas[i],
+                              expansoes=[(13, expansoes[0][1][i])], periodo_emissao_meses=6)
+        for nome in ('evitadas', 'acumulado', 'emitidos', 'emitidos_acumulados', 'safras'):
+            np.testing.assert_allclose(conjunto[nome][i], individual[nome][0])
+
+@pytest.mark.parametrize("argumentos", [
+    {'horizonte_anos': 0},
+    {'horizonte_anos': HORIZONTE_MAXIMO_ANOS + 1},
+    {'granularidade': 'semanal'},
+    {'periodo_emissao_meses': 0},
+    {'expansoes': [(49, 1.0)]},
+])
+def test_entradas_invalidas(argumentos):
+    parametros = {'emissoes_evitadas_ano': 1.0, 'horizonte_anos': 4, **argumentos}
+    with pytest.raises(ValueError):
+        projetar(**parametros)
+
+def test_base_mensal():
+    # Série mensal (ex.: DOCf sazonal) usada diretamente, com rampa e expansão aplicadas
+    base_mensal = np.tile(np.arange(1.0, 13.0), (2, 2))
+    projecao = projetar(base_mensal, 2, granularidade='mensal', rampa_meses=[0, 12],
+                        expansoes=[(13, np.array([1.0, 0.0]))])
+
+    np.testing.assert_allclose(projecao['evitadas'][0], base_mensal[0] * np.repeat([1.0, 2.0], 12))
+    np.testing.assert_allclose(projecao['evitadas'][1, :12], base_mensal[1, :12] * np.arange(1, 13) / 12)
+    np.testing.assert_allclose(projecao['safras'][0], [78.0, 156.0])
+
+    with pytest.raises(ValueError, match="24 meses"):
+        projetar(base_mensal[:, :12], 2)
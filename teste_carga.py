@@ -0,0 +1,326 @@
+"""Teste de carga do simulador com sessões concorrentes em um único servidor Streamlit
+
+Uso:
+
+    python teste_carga.py --sessoes 1,2,4,8,16 --reruns 5
+
+Para cada nível de concorrência, um servidor `streamlit run app.py` é
+iniciado em um processo próprio, com banco SQLite novo e as cotações
+(Investing.com, AwesomeAPI) substituídas por stubs locais, com latência de
+rede opcional. Após um aquecimento que apenas abre o app, todas as sessões
+se conectam ao mesmo servidor pelo websocket do navegador
+(`/_stcore/stream`) e, juntas, calculam os créditos e fazem novos reruns
+alterando os ciclos por ano. Os números medem, portanto, a capacidade de um
+servidor; o cliente roda na mesma máquina e também consome CPU.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import requests
+
+CAMINHO_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+# =============================================================================
+# STUBS DE REDE
+# =============================================================================
+
+HTML_INVESTING = '<html><body><span data-test="instrument-price-last">85.50</span></body></html>'
+
+class RespostaStub:
+    """Resposta mínima compatível com o uso de `requests.get` no app"""
+
+    def __init__(self, conteudo=b"", dados_json=None, status_code=200):
+        self.content = conteudo
+        self.text = conteudo.decode('utf-8')
+        self._dados_json = dados_json
+        self.status_code = status_code
+
+    def json(self):
+        return self._dados_json
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+def criar_stub_requests(latencia_rede=0.0):
+    """Cria um substituto de `requests.get` que responde localmente"""
+    def get(url, *args, **kwargs):
+        if latencia_rede > 0:
+            time.sleep(latencia_rede)
+        if "investing.com" in url:
+            return RespostaStub(HTML_INVESTING.encode('utf-8'))
+        if "awesomeapi" in url:
+            return RespostaStub(dados_json={'EURBRL': {'bid': '5.50'}})
+        if "exchangerate-api" in url:
+            return RespostaStub(dados_json={'rates': {'BRL': 5.50}})
+        raise requests.ConnectionError(f"Sem stub para {url}")
+    return get
+
+# =============================================================================
+# SERVIDOR STREAMLIT
+# =============================================================================
+
+def executar_servidor(porta, latencia_rede=0.0):
+    """Roda `streamlit run app.py` neste processo, com as cotações substituídas por stubs"""
+    from unittest import mock
+    from streamlit.web import cli
+
+    mock.patch.object(requests, 'get', criar_stub_requests(latencia_rede)).start()
+    sys.argv = [
+        "streamlit", "run", CAMINHO_APP,
+        "--server.headless", "true",
+        "--server.address", "127.0.0.1",
+        "--server.port", str(porta),
+        "--server.fileWatcherType", "none",
+        "--browser.gatherUsageStats", "false",
+        "--logger.level", "error",
+    ]
+    cli.main()
+
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def iniciar_servidor(caminho_banco, latencia_rede, caminho_log, timeout=60):
+    """Inicia o servidor em um subprocesso e espera ele responder; retorna (processo, porta)"""
+    porta = _porta_livre()
+    ambiente = dict(os.environ, COMPOSTAGEM_DB=caminho_banco)
+    with open(caminho_log, "wb") as log:
+        processo = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--servidor", str(porta),
+             "--latencia-rede", str(latencia_rede)],
+            env=ambiente, stdout=log, stderr=subprocess.STDOUT
+        )
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if processo.poll() is not None:
+            break
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{porta}/_stcore/health", timeout=1) as resposta:
+                if resposta.status == 200:
+                    return processo, porta
+        except OSError:
+            time.sleep(0.2)
+    processo.kill()
+    with open(caminho_log, encoding="utf-8", errors="replace") as log:
+        raise RuntimeError(f"O servidor Streamlit não iniciou:\n{log.read()[-2000:]}")
+
+def memoria_processo(pid):
+    """Memória residente atual e pico (bytes) de um processo, lidos de /proc (Linux)"""
+    valores = {'VmRSS': np.nan, 'VmHWM': np.nan}
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for linha in status:
+                campo, _, valor = linha.partition(":")
+                if campo in valores:
+                    valores[campo] = int(valor.split()[0]) * 1024
+    except OSError:
+        pass
+    return valores['VmRSS'], valores['VmHWM']
+
+# =============================================================================
+# SESSÕES SIMULADAS (WEBSOCKET)
+# =============================================================================
+
+class SessaoNavegador:
+    """Sessão do app conversando com o servidor como o navegador, pelo websocket"""
+
+    def __init__(self, porta, timeout):
+        self.url = f"ws://127.0.0.1:{porta}/_stcore/stream"
+        self.timeout = timeout
+        self.estados = {}
+        self.widgets = {}
+        self._conexao = None
+
+    async def conectar(self):
+        from websockets.asyncio.client import connect
+
+        self._conexao = await connect(self.url, subprotocols=["streamlit"], max_size=None,
+                                      open_timeout=self.timeout)
+
+    async def fechar(self):
+        await self._conexao.close()
+
+    async def rerun(self, disparos=()):
+        """Envia um rerun com os estados atuais dos widgets e espera o script terminar
+
+        `disparos` são estados de um único rerun (cliques de botão). Retorna a
+        latência (s) entre o envio e o fim do script.
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        mensagem = BackMsg()
+        mensagem.rerun_script.query_string = ""
+        mensagem.rerun_script.widget_states.widgets.extend(list(self.estados.values()) + list(disparos))
+        inicio = time.perf_counter()
+        await self._conexao.send(mensagem.SerializeToString())
+
+        self.widgets = {}
+        while True:
+            resposta = ForwardMsg()
+            resposta.ParseFromString(await asyncio.wait_for(self._conexao.recv(), self.timeout))
+            tipo = resposta.WhichOneof('type')
+            if tipo == 'delta' and resposta.delta.WhichOneof('type') == 'new_element':
+                elemento = resposta.delta.new_element
+                tipo_elemento = elemento.WhichOneof('type')
+                if tipo_elemento == 'exception':
+                    raise RuntimeError(elemento.exception.message)
+                if tipo_elemento in ('button', 'slider'):
+                    widget = getattr(elemento, tipo_elemento)
+                    self.widgets[widget.label] = widget
+            elif tipo == 'script_finished':
+                return time.perf_counter() - inicio
+
+    async def clicar(self, prefixo_rotulo):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        botao = next(w for rotulo, w in self.widgets.items() if rotulo.startswith(prefixo_rotulo))
+        return await self.rerun([WidgetState(id=botao.id, trigger_value=True)])
+
+    async def ajustar_slider(self, rotulo, valor):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        estado = WidgetState(id=self.widgets[rotulo].id)
+        estado.double_array_value.data.append(valor)
+        self.estados[estado.id] = estado
+        return await self.rerun()
+
+async def simular_sessao(sessao, indice, n_reruns):
+    """Calcula os créditos e faz `n_reruns` reruns alterando os ciclos por ano"""
+    latencias = [await sessao.clicar("🚀")]
+    for k in range(n_reruns):
+        latencias.append(await sessao.ajustar_slider("Ciclos completos por ano", (indice + k) % 12 + 1))
+    return latencias
+
+async def _abrir_sessoes(porta, n_sessoes, timeout):
+    """Aquece o servidor e abre `n_sessoes` sessões com o app carregado
+
+    O aquecimento (importações e caches de módulo do servidor) apenas abre o
+    app, sem calcular, para não pré-carregar resultados das sessões medidas.
+    """
+    aquecimento = SessaoNavegador(porta, timeout)
+    await aquecimento.conectar()
+    await aquecimento.rerun()
+    await aquecimento.fechar()
+
+    sessoes = [SessaoNavegador(porta, timeout) for _ in range(n_sessoes)]
+    for sessao in sessoes:
+        await sessao.conectar()
+        await sessao.rerun()
+    return sessoes
+
+async def _executar_sessao(sessao, indice, n_reruns):
+    resultado = {'latencias': [], 'erro': None}
+    try:
+        resultado['latencias'] = await simular_sessao(sessao, indice, n_reruns)
+    except Exception as e:
+        resultado['erro'] = f"{type(e).__name__}: {e}"
+    return resultado
+
+async def _medir_sessoes(processo, porta, n_sessoes, n_reruns, timeout):
+    """Executa as sessões juntas e lê a memória do servidor antes e depois
+
+    As sessões ficam conectadas até a leitura final, para que a memória
+    retida por elas seja contada. Retorna os resultados por sessão, a
+    duração total (s) e a memória residente (inicial, final, pico) em bytes.
+    """
+    sessoes = await _abrir_sessoes(porta, n_sessoes, timeout)
+    memoria_inicial, _ = memoria_processo(processo.pid)
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(*(_executar_sessao(sessao, indice, n_reruns)
+                                        for indice, sessao in enumerate(sessoes)))
+    duracao = time.perf_counter() - inicio
+    memoria_final, pico_memoria = memoria_processo(processo.pid)
+    for sessao in sessoes:
+        await sessao.fechar()
+    return resultados, duracao, (memoria_inicial, memoria_final, pico_memoria)
+
+def medir_nivel(n_sessoes, n_reruns, timeout, latencia_rede, diretorio):
+    """Executa `n_sessoes` sessões concorrentes em um servidor novo e resume latência, vazão e memória
+
+    A memória por sessão é o crescimento da memória residente do servidor
+    entre o aquecimento e o fim das sessões (ainda conectadas), dividido pelo
+    número de sessões.
+    """
+    caminho_banco = os.path.join(diretorio, f"carga_{n_sessoes}.sqlite3")
+    caminho_log = os.path.join(diretorio, f"servidor_{n_sessoes}.log")
+    processo, porta = iniciar_servidor(caminho_banco, latencia_rede, caminho_log, timeout)
+
+    try:
+        resultados, duracao, (memoria_inicial, memoria_final, pico_memoria) = asyncio.run(
+            _medir_sessoes(processo, porta, n_sessoes, n_reruns, timeout)
+        )
+    finally:
+        processo.terminate()
+        processo.wait(timeout=timeout)
+
+    erros = [r['erro'] for r in resultados if r['erro']]
+    for erro in sorted(set(erros)):
+        print(f"  erro: {erro}", flush=True)
+
+    latencias_ms = np.concatenate([r['latencias'] for r in resultados] + [[]]) * 1000
+    p50, p90, p99 = np.percentile(latencias_ms, [50, 90, 99]) if latencias_ms.size else (np.nan,) * 3
+    return {
+        'sessoes': n_sessoes,
+        'reruns': latencias_ms.size,
+        'erros': len(erros),
+        'latencia_p50_ms': p50,
+        'latencia_p90_ms': p90,
+        'latencia_p99_ms': p99,
+        'vazao_reruns_s': latencias_ms.size / duracao,
+        'memoria_por_sessao_mb': (memoria_final - memoria_inicial) / n_sessoes / 1024 ** 2,
+        'pico_memoria_servidor_mb': pico_memoria / 1024 ** 2,
+        'duracao_s': duracao,
+    }
+
+def executar_teste_carga(niveis, n_reruns=5, latencia_rede=0.0, timeout=60):
+    """Mede cada nível de concorrência e retorna um DataFrame com os resultados"""
+    resultados = []
+    with tempfile.TemporaryDirectory() as diretorio:
+        for n_sessoes in niveis:
+            resultado = medir_nivel(n_sessoes, n_reruns, timeout, latencia_rede, diretorio)
+            resultados.append(resultado)
+            print(f"{n_sessoes:>4} sessões | p50 {resultado['latencia_p50_ms']:8.1f} ms | "
+                  f"p99 {resultado['latencia_p99_ms']:8.1f} ms | "
+                  f"{resultado['vazao_reruns_s']:6.1f} reruns/s | "
+                  f"{resultado['memoria_por_sessao_mb']:6.2f} MB/sessão | erros {resultado['erros']}",
+                  flush=True)
+    return pd.DataFrame(resultados)
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga do simulador com sessões concorrentes")
+    parser.add_argument("--sessoes", default="1,2,4,8,16",
+                        help="Níveis de sessões concorrentes, separados por vírgula")
+    parser.add_argument("--reruns", type=int, default=5, help="Reruns extras por sessão após o cálculo")
+    parser.add_argument("--latencia-rede", type=float, default=0.0,
+                        help="Latência simulada (s) de cada requisição de cotação")
+    parser.add_argument("--timeout", type=float, default=60, help="Timeout (s) de cada rerun")
+    parser.add_argument("--saida", default=None, help="Arquivo CSV para gravar os resultados")
+    parser.add_argument("--servidor", type=int, default=None, metavar="PORTA", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.servidor is not None:
+        executar_servidor(args.servidor, args.latencia_rede)
+        return
+
+    niveis = [int(n) for n in args.sessoes.split(",") if n.strip()]
+    resultados = executar_teste_carga(niveis, args.reruns, args.latencia_rede, args.timeout)
+    print()
+    print(resultados.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    if args.saida:
+        resultados.to_csv(args.saida, index=False)
+
+if __name__ == "__main__":
+    main()